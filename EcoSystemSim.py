@@ -1,14 +1,26 @@
 import tkinter as tk
+import _tkinter
 from tkinter import ttk, messagebox, simpledialog
 import asyncio
 import logging
+import logging.handlers
 import os
+import queue
+import threading
 import time
 import collections # Added import
+import contextlib
 from asyncua import ua
-from opcua_client import OPCUAClient
+from opcua_client import OPCUAClient, warn_throttled
+try:
+    import uvloop # Optional: lower per-callback overhead for the OPC UA IO loop
+except ImportError:
+    uvloop = None
 from lift_visualization import LiftVisualizationManager, LIFTS, LIFT1_ID, LIFT2_ID # Import new manager and constants
 
+NO_ERROR_DATA = {"iErrorCode": 0} # PLC data that signifies no error, used to reset the error display
+_NOT_CACHED = object() # Marks a PLC variable never stored in the data cache; None already means a failed read
+
 # Define Cancel Reason Codes and Texts
 CANCEL_REASON_TEXTS = {
     0: "No cancel reason",
@@ -36,14 +48,20 @@ if (os.path.exists(log_filename)):
         print(f"Warning: Could not clear log file {log_filename}: {e}")
 
 log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+_log_file_handler = logging.FileHandler(log_filename, mode='a') # Log to file (append mode after clearing)
+_log_console_handler = logging.StreamHandler() # Keep logging to console as well
+for _handler in (_log_file_handler, _log_console_handler):
+    _handler.setFormatter(logging.Formatter(log_format))
+
+# The GUI and OPC UA IO threads only enqueue records; a listener thread does the actual file/console I/O
+log_queue = queue.SimpleQueue() # Unbounded and lock-free on put, unlike queue.Queue
 logging.basicConfig(
     level=logging.INFO,
-    format=log_format,
-    handlers=[
-        logging.FileHandler(log_filename, mode='a'), # Log to file (append mode after clearing)
-        logging.StreamHandler() # Keep logging to console as well
-    ]
+    format='%(message)s', # The listener's handlers add the prefix; QueueHandler only merges args into the message
+    handlers=[logging.handlers.QueueHandler(log_queue)]
 )
+log_listener = logging.handlers.QueueListener(log_queue, _log_file_handler, _log_console_handler)
+log_listener.start()
 logger = logging.getLogger("EcoSystemSim_DualLift_ST")
 
 # Set asyncua loggers to a higher level to reduce verbosity
@@ -64,6 +82,77 @@ SYS_YELLOW_DIM = '#ADAD00' # Dark Yellow
 SYS_GREEN_BRIGHT = '#00FF00'
 SYS_GREEN_DIM = '#006400'  # Dark Green
 SYS_BLACK = '#000000' # For border
+_STACK_LIGHT_RED = (SYS_RED_BRIGHT, SYS_YELLOW_DIM, SYS_GREEN_DIM)
+_STACK_LIGHT_YELLOW = (SYS_RED_DIM, SYS_YELLOW_BRIGHT, SYS_GREEN_DIM)
+_STACK_LIGHT_GREEN = (SYS_RED_DIM, SYS_YELLOW_DIM, SYS_GREEN_BRIGHT)
+_STACK_LIGHT_OFF = (SYS_RED_DIM, SYS_YELLOW_DIM, SYS_GREEN_DIM)
+# Stack light state key -> (red, yellow, green) fill
+STACK_LIGHT_STATES = {
+    'red': _STACK_LIGHT_RED, 'error': _STACK_LIGHT_RED,
+    'yellow': _STACK_LIGHT_YELLOW, 'warning': _STACK_LIGHT_YELLOW, 'busy': _STACK_LIGHT_YELLOW,
+    'green': _STACK_LIGHT_GREEN, 'ok': _STACK_LIGHT_GREEN, 'connected_idle': _STACK_LIGHT_GREEN, # Connected, no issues/activity
+    'off': _STACK_LIGHT_OFF,
+}
+
+# Tk event pump (run_gui): poll interval adapts between these bounds depending on Tk activity
+GUI_POLL_MIN_INTERVAL_S = 0.005
+GUI_POLL_MAX_INTERVAL_S = 0.04
+GUI_MAX_EVENTS_PER_POLL = 100 # Yield back to asyncio even if Tk keeps producing events
+# Monitor -> GUI hand-off: the monitor never waits for Tk; a posted snapshot is drawn once Tk is idle.
+# While a lift animation has not settled the GUI redraws at this interval
+GUI_REFRESH_INTERVAL_MS = 30
+PLC_POLL_INTERVAL_S = 0.25 # Polling fallback only; a user command triggers an immediate poll
+PLC_POLL_READ_TIMEOUT_S = 1.0 # A poll read taking longer is abandoned; the cache keeps the previous values
+PLC_SUBSCRIPTION_PUBLISH_INTERVAL_MS = 100 # How often the server sends queued data changes; bounds PLC -> GUI latency
+PLC_CHANGE_COALESCE_S = 0.05 # After a data change notification, wait this long for related changes before queueing
+WATCHDOG_INTERVAL_S = 0.5 # EcoSystem -> PLC watchdog pulse, written independently of the monitor loop
+WATCHDOG_MAX_FAILED_PULSES = 6 # Consecutive failed pulses (3 s) before the connection is treated as lost
+IO_SHUTDOWN_TIMEOUT_S = 2.0 # Upper bound for each step of shutdown_io, so closing the window never hangs on the PLC
+SEQ_STEP_HISTORY_LEN = 5 # Step comments kept and shown per lift, newest first
+ACTION_STATUS_DISPLAY_MS = 3000 # How long a write confirmation stays visible in the connection frame
+
+# PLC variables monitored per lift: gui_key -> (path_type, sub_path)
+PLC_VARS_TO_READ = {
+    "iCycle": ("StationData", "iCycle"),
+    "iStationStatus": ("StationData", "iStationStatus"),
+    "sSeq_Step_comment": ("Elevator", "sSeq_Step_comment"), 
+    "iCancelAssignmentReasonCode": ("StationData", "iCancelAssignment"),
+    "sErrorShortDescription": ("StationData", "sShortAlarmDescription"),
+    "sErrorSolution": ("StationData", "sAlarmSolution"),
+    "iElevatorRowLocation": ("Elevator", "iElevatorRowLocation"), 
+    "xTrayInElevator": ("Elevator", "xTrayInElevator"),           
+    "iCurrentForkSide": ("Elevator", "iCurrentForkSide"),         
+    "iErrorCode": ("Elevator", "iErrorCode"),                   
+    # Actieve job parameters van de PLC (gepubliceerd door PLC)
+    # "ActiveTask", "ActiveOrigin", "ActiveDest" zijn VERWIJDERD omdat we deze nu uit de lokale cache halen
+}
+
+# Status section labels showing values read from the PLC
+PLC_STATUS_LABEL_VARS = ("iCycle", "iStationStatus", "iElevatorRowLocation", "xTrayInElevator", "iCurrentForkSide")
+# Status section labels voor laatst verzonden job parameters: (label name, last_sent_job_params key)
+SENT_PARAM_LABEL_KEYS = (
+    ("iTaskType", "SentTaskType"),
+    ("iOrigination", "SentOrigin"),
+    ("iDestination", "SentDestination"),
+)
+# Status section grid: (var_name, row, label column), two label/value pairs per row
+STATUS_LABEL_LAYOUT = tuple(
+    (var_name, idx // 2, (idx % 2) * 2)
+    for idx, var_name in enumerate(PLC_STATUS_LABEL_VARS + tuple(var_name for var_name, _ in SENT_PARAM_LABEL_KEYS))
+)
+
+# Slow-changing PLC texts: reads within this TTL are served from the OPCUAClient cache (polling fallback only)
+SLOW_CHANGING_PLC_VARS = ("sErrorShortDescription", "sErrorSolution")
+SLOW_CHANGING_PLC_VAR_TTL_MS = 2000
+# Server-side sampling intervals for the subscription: motion/state values fast, alarm texts slow
+FAST_PLC_VAR_SAMPLING_MS = 50
+SLOW_PLC_VAR_SAMPLING_MS = 500
+
+# Global handshake variables (shared by all lifts): gui_key -> EcoSystemGUI_DualLift_ST attribute
+GLOBAL_HANDSHAKE_ATTRS = {
+    "iJobType": "global_handshake_job_type",
+    "iRowNr": "global_handshake_row_nr",
+}
 
 # Visualisation constants are now in lift_visualization.py
 # CANVAS_HEIGHT, CANVAS_WIDTH, etc. are not needed here directly anymore if LiftVisualizationManager handles them internally.
@@ -75,16 +164,33 @@ class EcoSystemGUI_DualLift_ST:
         self.root.geometry("1250x750") # Adjusted for potentially wider right panel and new button
         self.opcua_client = OPCUAClient(PLC_ENDPOINT, PLC_NS_URI)
         self.is_connected = False
-        self.monitoring_task = None
+        self.monitoring_task = None # asyncio.Task on the IO loop
+        self.watchdog_task = None # asyncio.Task on the IO loop
         self.all_lift_data_cache = {lift_id: {} for lift_id in LIFTS} # Cache for error states
+        self._pending_gui_snapshot = {} # lift_id -> newest plc_data snapshot from the monitor, not yet drawn
+        self._spare_gui_snapshot = {} # Second buffer, swapped with the pending one so no dict is allocated per refresh
+        self._gui_snapshot_lock = threading.Lock() # Guards _pending_gui_snapshot between the IO and GUI threads
+        self._last_drawn_state = {} # lift_id -> (plc_data, handshake) last applied by _apply_gui_snapshot
+        self._plc_data_changed = None # asyncio.Event on the IO loop, set by _store_plc_value; created by _monitor_plc
+        self._subscription_lost = False # Set on the IO loop when the subscription reports a bad status
+        self._poll_requested = None # asyncio.Event on the IO loop, set by _request_plc_refresh; created by _monitor_plc
+        self._dirty_lifts = set() # Lifts whose data changed since the last snapshot was queued
+        self._last_warning_at = {} # warn_throttled key -> monotonic time its warning was last logged (IO loop)
 
         self.lift_frames = {}
+        self._visible_lift = LIFTS[0] # Lift whose notebook tab is selected; only its tab widgets are kept up to date
+        self._stale_step_comments = set() # Lifts whose step comment widget lags their history (tab was hidden)
         self.status_labels = {}
+        self.status_label_vars = {lift_id: {} for lift_id in LIFTS} # lift_id -> var_name -> StringVar shown by the status label
+        self._last_displayed = {lift_id: {} for lift_id in LIFTS} # Last text set per status label, to skip unchanged updates
+        self._last_label_values = {lift_id: {} for lift_id in LIFTS} # Last raw PLC value per status label, to skip formatting unchanged values
+        self._last_text = {} # Text widget -> content last set through _set_text; label -> (text, foreground) set through _set_label
+        self._last_section_state = {lift_id: {} for lift_id in LIFTS} # Per lift: section name -> state tuple last drawn
         self.job_controls = {}
         self.ack_controls = {}
         self.error_controls = {}
         self.lift_tray_status = {lift_id: False for lift_id in LIFTS} 
-        self.seq_step_history = {lift_id: collections.deque(maxlen=5) for lift_id in LIFTS} 
+        self.seq_step_history = {lift_id: collections.deque(maxlen=SEQ_STEP_HISTORY_LEN) for lift_id in LIFTS} 
         self.last_sent_job_params = {lift_id: {} for lift_id in LIFTS} # Cache for last sent job
 
         # OPC UA Path Constants
@@ -96,18 +202,48 @@ class EcoSystemGUI_DualLift_ST:
         self.global_handshake_row_nr = 0
         self._prev_global_ack_state = False # Tracks if PLC was awaiting global ack
 
+        # Monitored and written OPC UA paths, built once
+        self._monitor_targets = self._build_monitor_targets()
+        self._lift_write_paths = self._build_lift_write_paths()
+        self._sampling_intervals_ms = {
+            full_opc_path: SLOW_PLC_VAR_SAMPLING_MS if gui_key in SLOW_CHANGING_PLC_VARS else FAST_PLC_VAR_SAMPLING_MS
+            for full_opc_path, (_, gui_key) in self._monitor_targets.items()
+        }
+        self._watchdog_path = f"{self.ECO_TO_PLC_BASE}/xWatchDog"
+        for full_opc_path, (_, gui_key) in self._monitor_targets.items():
+            if gui_key in SLOW_CHANGING_PLC_VARS:
+                self.opcua_client.set_cache_ttl(full_opc_path, SLOW_CHANGING_PLC_VAR_TTL_MS)
+
         # For system stack light
         self.system_stack_light_canvas = None
-        self.system_stack_light_red_rect = None
-        self.system_stack_light_yellow_rect = None
-        self.system_stack_light_green_rect = None
+        self._stack_light_rects = () # (red, yellow, green) canvas item ids
+        self._stack_light_fills = [None, None, None] # Fill last set per light, to skip unchanged itemconfig calls
 
+        self._grid_frames_to_freeze = [] # Filled by the section builders, frozen once the whole layout exists
         self._setup_gui_layout()
+        self._freeze_grid_sizes()
+        # Split once which status widgets are Labels and which is the step comment Text, for resets on disconnect
+        self._status_reset_widgets = {
+            lift_id: (tuple(var_name for var_name, widget in labels.items() if isinstance(widget, ttk.Label)),
+                      labels.get("sSeq_Step_comment"))
+            for lift_id, labels in self.status_labels.items()
+        }
         
         # Initialize LiftVisualizationManager after canvas is created in _setup_gui_layout
         self.lift_vis_manager = LiftVisualizationManager(self.root, self.shared_canvas, LIFTS)
         
         self.update_system_stack_light('off') # Initial state
+        # The monitor wakes the GUI loop only when it posted a snapshot, so an idle GUI runs no refresh timer
+        self._gui_loop = asyncio.get_running_loop()
+        self._gui_refresh_scheduled = False # Guarded by _gui_snapshot_lock
+
+        # The OPC UA client, monitor and watchdog live on their own event loop thread, so Tk activity
+        # (window drags, modal dialogs) never stalls PLC communication
+        self._io_loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+        self._io_loop.set_exception_handler(_log_asyncio_exception)
+        self._io_thread = threading.Thread(target=self._io_loop.run_forever, name="OPCUA-IO", daemon=True)
+        self._io_thread.start()
+        self._io_shutdown_started = False
 
     def _setup_gui_layout(self):
         """Creates the main GUI layout, frames, and widgets."""
@@ -154,21 +290,15 @@ class EcoSystemGUI_DualLift_ST:
         border_width = 1
         canvas_center_x = 50 / 2
 
-        # Red light (top)
-        self.system_stack_light_red_rect = self.system_stack_light_canvas.create_rectangle(
-            canvas_center_x - rect_width/2, 5, canvas_center_x + rect_width/2, 5 + rect_height,
-            fill=SYS_RED_DIM, outline=SYS_BLACK, width=border_width
-        )
-        # Yellow light (middle)
-        self.system_stack_light_yellow_rect = self.system_stack_light_canvas.create_rectangle(
-            canvas_center_x - rect_width/2, 5 + rect_height, canvas_center_x + rect_width/2, 5 + 2 * rect_height,
-            fill=SYS_YELLOW_DIM, outline=SYS_BLACK, width=border_width
-        )
-        # Green light (bottom)
-        self.system_stack_light_green_rect = self.system_stack_light_canvas.create_rectangle(
-            canvas_center_x - rect_width/2, 5 + 2 * rect_height, canvas_center_x + rect_width/2, 5 + 3 * rect_height,
-            fill=SYS_GREEN_DIM, outline=SYS_BLACK, width=border_width
+        # Red (top), yellow (middle) and green (bottom) light, stacked
+        self._stack_light_rects = tuple(
+            self.system_stack_light_canvas.create_rectangle(
+                canvas_center_x - rect_width/2, 5 + i * rect_height, canvas_center_x + rect_width/2, 5 + (i + 1) * rect_height,
+                fill=dim_fill, outline=SYS_BLACK, width=border_width
+            )
+            for i, dim_fill in enumerate((SYS_RED_DIM, SYS_YELLOW_DIM, SYS_GREEN_DIM))
         )
+        self._stack_light_fills = [SYS_RED_DIM, SYS_YELLOW_DIM, SYS_GREEN_DIM]
 
     def _create_connection_frame(self):
         """Creates the connection management frame.""" # Corrected docstring quote
@@ -186,6 +316,23 @@ class EcoSystemGUI_DualLift_ST:
         # Row 2 for status labels
         self.connection_status_label = ttk.Label(conn_frame, text="Status: Disconnected", foreground="red")
         self.connection_status_label.grid(row=1, column=0, columnspan=2, sticky=tk.W, padx=5, pady=2)
+        self._connection_status = (False, "Status: Disconnected", "red") # What the label and buttons show right now
+        # Short-lived confirmations of routine PLC writes, instead of a modal dialog per write
+        self.action_status_label = ttk.Label(conn_frame, text="")
+        self.action_status_label.grid(row=1, column=2, columnspan=2, sticky=tk.W, padx=5, pady=2)
+        self._action_status_clear_id = None
+
+    def _flash_status(self, message: str, ok: bool = True):
+        """Shows message next to the connection status for ACTION_STATUS_DISPLAY_MS, without blocking the GUI."""
+        if self._action_status_clear_id is not None:
+            self.root.after_cancel(self._action_status_clear_id)
+        self.action_status_label.config(text=f"{message} @ {time.strftime('%H:%M:%S')}", foreground="green" if ok else "red")
+        self._action_status_clear_id = self.root.after(ACTION_STATUS_DISPLAY_MS, self._clear_flash_status)
+
+    def _clear_flash_status(self):
+        """Tk timer callback: removes the message shown by _flash_status."""
+        self._action_status_clear_id = None
+        self.action_status_label.config(text="")
 
     def _create_visualization_frame(self, parent_frame):
         """Creates the warehouse visualization frame and canvas."""
@@ -208,6 +355,21 @@ class EcoSystemGUI_DualLift_ST:
             self.notebook.add(lift_tab_frame, text=lift_id)
             self.lift_frames[lift_id] = lift_tab_frame
             self._create_lift_controls(lift_tab_frame, lift_id)
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_lift_tab_changed)
+
+    def _on_lift_tab_changed(self, event=None):
+        """Redraws the widgets of the newly selected lift tab, which are not updated while the tab is hidden."""
+        lift_id = self.notebook.tab(self.notebook.select(), "text")
+        if lift_id == self._visible_lift:
+            return
+        self._visible_lift = lift_id
+        comment_widget = self.status_labels.get(lift_id, {}).get("sSeq_Step_comment")
+        if lift_id in self._stale_step_comments and comment_widget is not None:
+            self._stale_step_comments.discard(lift_id)
+            self._set_text(comment_widget, "\n".join(self.seq_step_history[lift_id]))
+        drawn_state = self._last_drawn_state.get(lift_id)
+        if drawn_state is not None:
+            self._update_gui_for_lift(lift_id, drawn_state[0])
 
     def _create_lift_controls(self, parent_frame, lift_id):
         """Creates the status, job, ack, and error control sections for a single lift."""
@@ -223,31 +385,38 @@ class EcoSystemGUI_DualLift_ST:
 
     def _create_status_section(self, parent_frame, lift_id):
         """Creates the status display section for a lift."""
-        status_vars_to_display = [
-            "iCycle", "iStationStatus", "iElevatorRowLocation", 
-            "xTrayInElevator", "iCurrentForkSide",
-            "iTaskType", "iOrigination", "iDestination"  # Labels voor laatst verzonden job parameters
-        ]
         status_frame = ttk.LabelFrame(parent_frame, text=f"{lift_id} Status", padding=10)
         status_frame.pack(fill=tk.X, pady=5)
         self.status_labels[lift_id] = {}
-        row_idx, col_idx = 0, 0
-        for var_name in status_vars_to_display:
-            ttk.Label(status_frame, text=f"{var_name}:").grid(row=row_idx, column=col_idx*2, sticky=tk.W, padx=5, pady=2)
-            label = ttk.Label(status_frame, text="N/A", width=25, anchor="w")
-            label.grid(row=row_idx, column=col_idx*2+1, sticky=tk.W, padx=5, pady=2)
-            self.status_labels[lift_id][var_name] = label
-            col_idx += 1
-            if col_idx >= 2: 
-                col_idx = 0
-                row_idx += 1
+        for var_name, row_idx, col_idx in STATUS_LABEL_LAYOUT:
+            ttk.Label(status_frame, text=f"{var_name}:").grid(row=row_idx, column=col_idx, sticky=tk.W, padx=5, pady=2)
+            label = self._create_status_value_label(status_frame, lift_id, var_name, width=25, anchor="w")
+            label.grid(row=row_idx, column=col_idx+1, sticky=tk.W, padx=5, pady=2)
+        self._grid_frames_to_freeze.append(status_frame)
+
+    def _create_status_value_label(self, parent_frame, lift_id, var_name, **label_options):
+        """Creates a status label whose text is bound to a StringVar, so updates are a plain variable set."""
+        text_var = tk.StringVar(value="N/A")
+        label = ttk.Label(parent_frame, textvariable=text_var, **label_options)
+        self.status_label_vars[lift_id][var_name] = text_var
+        self.status_labels.setdefault(lift_id, {})[var_name] = label
+        return label
+
+    def _freeze_grid_sizes(self):
+        """Fixes the collected grid containers at their requested size, so text updates of their fixed-width children
+        don't make Tk recompute the grid geometry. One idle-tasks pass measures all of them."""
+        self.root.update_idletasks()
+        for frame in self._grid_frames_to_freeze:
+            frame.config(width=frame.winfo_reqwidth(), height=frame.winfo_reqheight())
+            frame.grid_propagate(False)
+        self._grid_frames_to_freeze.clear()
 
     def _create_step_info_section(self, parent_frame, lift_id):
         """Creates the step information (comment) section for a lift."""
         step_frame = ttk.LabelFrame(parent_frame, text=f"{lift_id} Stap Informatie", padding=10)
         step_frame.pack(fill=tk.X, pady=5)
         ttk.Label(step_frame, text="sSeq_Step_comment:").pack(side=tk.TOP, anchor=tk.W, padx=2, pady=1)
-        seq_step_text = tk.Text(step_frame, height=5, width=90, borderwidth=1, relief="groove") # Changed height from 3 to 5
+        seq_step_text = tk.Text(step_frame, height=SEQ_STEP_HISTORY_LEN, width=90, borderwidth=1, relief="groove") # One line per history entry
         seq_step_text.pack(fill=tk.X, padx=2, pady=1)
         seq_step_text.insert("1.0", "N/A")
         seq_step_text.config(state=tk.DISABLED)
@@ -324,7 +493,7 @@ class EcoSystemGUI_DualLift_ST:
         
         # Korte beschrijving
         ttk.Label(details_frame, text="Korte beschrijving:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
-        err_ctrls['short_description'] = ttk.Label(details_frame, text="None", foreground="gray")
+        err_ctrls['short_description'] = ttk.Label(details_frame, text="None", foreground="gray", width=50, anchor="w")
         err_ctrls['short_description'].grid(row=0, column=1, sticky=tk.W, padx=5, pady=2)
         
         # Uitgebreide foutmelding
@@ -338,6 +507,7 @@ class EcoSystemGUI_DualLift_ST:
         err_ctrls['solution'] = tk.Text(details_frame, height=2, width=50, borderwidth=1, relief="groove")
         err_ctrls['solution'].grid(row=2, column=1, sticky=tk.W, padx=5, pady=2)
         err_ctrls['solution'].config(state=tk.DISABLED)
+        self._grid_frames_to_freeze.append(details_frame)
         
         self.error_controls[lift_id] = err_ctrls
 
@@ -350,14 +520,13 @@ class EcoSystemGUI_DualLift_ST:
             self.status_labels[lift_id] = {}
 
         ttk.Label(cancel_frame, text="Cancel Code:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
-        code_label = ttk.Label(cancel_frame, text="N/A", width=10)
+        code_label = self._create_status_value_label(cancel_frame, lift_id, "iCancelAssignmentReasonCode", width=10)
         code_label.grid(row=0, column=1, sticky=tk.W, padx=5, pady=2)
-        self.status_labels[lift_id]["iCancelAssignmentReasonCode"] = code_label
 
         ttk.Label(cancel_frame, text="Reason Text:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=2)
-        text_label = ttk.Label(cancel_frame, text="N/A", width=40, wraplength=250, justify=tk.LEFT) # Added wraplength and justify
+        text_label = self._create_status_value_label(cancel_frame, lift_id, "sCancelAssignmentReasonText",
+                                                     width=40, wraplength=250, justify=tk.LEFT) # Added wraplength and justify
         text_label.grid(row=1, column=1, sticky=tk.W, padx=5, pady=2)
-        self.status_labels[lift_id]["sCancelAssignmentReasonText"] = text_label
 
     def _create_auto_mode_controls(self, parent_frame):
         """Creates the controls for the Automatic Mode."""
@@ -415,62 +584,42 @@ class EcoSystemGUI_DualLift_ST:
             logger.warning("update_system_stack_light called before canvas initialization.")
             return
 
-        # Default to all dim (which represents 'off')
-        red_fill = SYS_RED_DIM
-        yellow_fill = SYS_YELLOW_DIM
-        green_fill = SYS_GREEN_DIM
-
-        if state_key in ('red', 'error'):
-            red_fill = SYS_RED_BRIGHT
-        elif state_key in ('yellow', 'warning', 'busy'):
-            yellow_fill = SYS_YELLOW_BRIGHT
-        elif state_key in ('green', 'ok', 'connected_idle'): # 'connected_idle' for when connected and no issues/activity
-            green_fill = SYS_GREEN_BRIGHT
-        elif state_key == 'off':
-            pass # Defaults are already set for 'off' (all dim)
-        else:
+        fills = STACK_LIGHT_STATES.get(state_key)
+        if fills is None:
             logger.warning(f"Unknown state_key '{state_key}' for update_system_stack_light. Defaulting to 'off'.")
-            # Defaults to 'off' (all dim)
-
-        # Check if rect attributes exist before trying to itemconfig
-        if hasattr(self, 'system_stack_light_red_rect') and self.system_stack_light_red_rect:
-            self.system_stack_light_canvas.itemconfig(self.system_stack_light_red_rect, fill=red_fill)
-        if hasattr(self, 'system_stack_light_yellow_rect') and self.system_stack_light_yellow_rect:
-            self.system_stack_light_canvas.itemconfig(self.system_stack_light_yellow_rect, fill=yellow_fill)
-        if hasattr(self, 'system_stack_light_green_rect') and self.system_stack_light_green_rect:
-            self.system_stack_light_canvas.itemconfig(self.system_stack_light_green_rect, fill=green_fill)
-        
-        logger.debug(f"System stack light set to: {state_key} (R:{red_fill}, Y:{yellow_fill}, G:{green_fill})")
+            fills = _STACK_LIGHT_OFF
+
+        # Recolor only the lights whose fill changes; a stable state costs no Tk calls
+        changed = False
+        for idx, (rect, fill) in enumerate(zip(self._stack_light_rects, fills)):
+            if self._stack_light_fills[idx] != fill:
+                self.system_stack_light_canvas.itemconfig(rect, fill=fill)
+                self._stack_light_fills[idx] = fill
+                changed = True
+
+        if changed:
+            logger.debug("System stack light set to: %s (R:%s, Y:%s, G:%s)", state_key, *fills)
 
     def _determine_and_update_global_stack_light(self):
         """Determines the global system state and updates the stack light accordingly."""
         if not self.is_connected:
             self.update_system_stack_light('off')
             return
+        if not self.opcua_client.is_connected: # Connection lost without a GUI disconnect; values shown are read errors
+            self.update_system_stack_light('error')
+            return
 
-        any_lift_in_error = False
+        # One pass over the lifts: an error on any lift wins, otherwise a global handshake or active cycle means busy
+        any_lift_busy = self.global_handshake_job_type > 0
         for lift_id in LIFTS:
             lift_data = self.all_lift_data_cache.get(lift_id, {})
             if self._safe_get_int_from_data(lift_data, "iErrorCode") != 0:
-                any_lift_in_error = True
-                break
-        
-        if any_lift_in_error:
-            self.update_system_stack_light('error') # Red
-            return
-
-        # Check if global handshake is needed or any lift is performing an active cycle
-        any_lift_busy = False
-        if self.global_handshake_job_type > 0:
-            any_lift_busy = True
-        else:
-            for lift_id in LIFTS:
-                lift_data = self.all_lift_data_cache.get(lift_id, {})
+                self.update_system_stack_light('error') # Red
+                return
+            if not any_lift_busy:
                 plc_cycle = self._safe_get_int_from_data(lift_data, "iCycle", -1)
-                if plc_cycle not in [0, 10] and plc_cycle > 0 : # Active cycle
-                    any_lift_busy = True
-                    break
-        
+                any_lift_busy = plc_cycle > 0 and plc_cycle != 10 # Active cycle
+
         if any_lift_busy:
             self.update_system_stack_light('busy') # Yellow
             return
@@ -482,23 +631,20 @@ class EcoSystemGUI_DualLift_ST:
 
     async def _reset_job_inputs_on_server_for_lift(self, lift_id: str):
         """Resets iTaskType, iOrigination, and iDestination to 0 for a given lift on the OPC UA server."""
-        elevator_id_str = self._get_elevator_identifier(lift_id)
-        station_idx_for_opc_node = self._get_station_index(lift_id)
-
-        if elevator_id_str is None or station_idx_for_opc_node is None:
+        write_paths = self._lift_write_paths.get(lift_id)
+        if write_paths is None:
             logger.error(f"Cannot determine OPC identifiers for GUI lift ID: {lift_id} in _reset_job_inputs_on_server_for_lift")
             return
 
-        logger.info(f"Resetting job inputs on OPC server for {lift_id} ({elevator_id_str}).")
+        logger.info(f"Resetting job inputs on OPC server for {lift_id} ({self._get_elevator_identifier(lift_id)}).")
         try:
-            # Path for ElevatorXEcoSystAssignment object
-            assignment_base_path = f"{self.ECO_TO_PLC_BASE}/{elevator_id_str}/Elevator{station_idx_for_opc_node + 1}EcoSystAssignment"
-            
-            # Reset TaskType, Origination, Destination to 0
+            # Reset TaskType, Origination, Destination to 0 in one Write request
             # These are the variables the PLC reads for a new job.
-            success_type = await self.opcua_client.write_value(f"{assignment_base_path}/iTaskType", 0, ua.VariantType.Int64)
-            success_origin = await self.opcua_client.write_value(f"{assignment_base_path}/iOrigination", 0, ua.VariantType.Int64)
-            success_dest = await self.opcua_client.write_value(f"{assignment_base_path}/iDestination", 0, ua.VariantType.Int64)
+            success_type, success_origin, success_dest = await self._run_io(self.opcua_client.write_values([
+                (write_paths["iTaskType"], 0, ua.VariantType.Int64),
+                (write_paths["iOrigination"], 0, ua.VariantType.Int64),
+                (write_paths["iDestination"], 0, ua.VariantType.Int64),
+            ]))
 
             if success_type and success_origin and success_dest:
                 logger.info(f"Successfully reset job inputs (TaskType, Origination, Destination) for {lift_id} on OPC server.")
@@ -527,159 +673,398 @@ class EcoSystemGUI_DualLift_ST:
         logger.error(f"Cannot determine station index for GUI ID: {lift_id_gui}")
         return None
 
+    def _build_monitor_targets(self):
+        """Maps every monitored OPC UA path to (lift_id, gui_key). lift_id is None for the global handshake variables."""
+        targets = {}
+        for lift_id in LIFTS:
+            station_idx_for_opc = self._get_station_index(lift_id)
+            elevator_id_str = self._get_elevator_identifier(lift_id)
+            if station_idx_for_opc is None or elevator_id_str is None:
+                logger.error(f"Cannot determine OPC identifiers for GUI lift ID: {lift_id}")
+                continue
+
+            for gui_key, (path_type, sub_path_template) in PLC_VARS_TO_READ.items():
+                if path_type == "StationData":
+                    full_opc_path = f"{self.PLC_TO_ECO_BASE}/StationData/{station_idx_for_opc}/{sub_path_template}"
+                elif path_type == "Elevator":
+                    full_opc_path = f"{self.PLC_TO_ECO_BASE}/{elevator_id_str}/{sub_path_template}"
+                else:
+                    logger.warning(f"Unknown path_type: {path_type} for gui_key: {gui_key}")
+                    continue
+                targets[full_opc_path] = (lift_id, gui_key)
+
+        handshake_base_path = f"{self.PLC_TO_ECO_BASE}/StationDataToEco/ExtraData/Handshake"
+        for gui_key in GLOBAL_HANDSHAKE_ATTRS:
+            targets[f"{handshake_base_path}/{gui_key}"] = (None, gui_key)
+        return targets
+
+    def _build_lift_write_paths(self):
+        """Builds the OPC UA paths of the variables the GUI writes, per lift: {lift_id: {var_name: path}}."""
+        write_paths = {}
+        for lift_id in LIFTS:
+            elevator_id_str = self._get_elevator_identifier(lift_id)
+            station_idx_for_opc_node = self._get_station_index(lift_id)
+            if elevator_id_str is None or station_idx_for_opc_node is None:
+                logger.error(f"Cannot determine OPC identifiers for GUI lift ID: {lift_id}")
+                continue
+
+            # Path for variables directly under ElevatorX object
+            lift_base_path = f"{self.ECO_TO_PLC_BASE}/{elevator_id_str}"
+            # Path for ElevatorXEcoSystAssignment object
+            assignment_base_path = f"{lift_base_path}/Elevator{station_idx_for_opc_node + 1}EcoSystAssignment"
+            write_paths[lift_id] = {
+                "iTaskType": f"{assignment_base_path}/iTaskType",
+                "iOrigination": f"{assignment_base_path}/iOrigination",
+                "iDestination": f"{assignment_base_path}/iDestination",
+                "xAcknowledgeMovement": f"{lift_base_path}/xAcknowledgeMovement",
+                "iCancelAssignment": f"{lift_base_path}/iCancelAssignment",
+                # PLC output variable; writing it overrides the PLC state (tray toggle)
+                "xTrayInElevator": f"{self.PLC_TO_ECO_BASE}/{elevator_id_str}/xTrayInElevator",
+            }
+        return write_paths
+
+    def _store_plc_value(self, full_opc_path, value):
+        """Stores a value read from (or pushed by) the PLC in the data cache. Unchanged values mark nothing dirty."""
+        lift_id, gui_key = self._monitor_targets[full_opc_path]
+        if lift_id is not None:
+            lift_data = self.all_lift_data_cache[lift_id]
+            if lift_data.get(gui_key, _NOT_CACHED) == value:
+                return
+            lift_data[gui_key] = value # None marks a failed read
+            self._dirty_lifts.add(lift_id)
+        elif value is not None:
+            attr_name = GLOBAL_HANDSHAKE_ATTRS[gui_key]
+            new_value = self._safe_int(value, default=0)
+            if getattr(self, attr_name) == new_value:
+                return
+            setattr(self, attr_name, new_value)
+            self._dirty_lifts.update(LIFTS) # The global handshake is shown on every lift tab
+        else:
+            warn_throttled(logger, self._last_warning_at, f"read:{full_opc_path}",
+                           "Failed to read global %s from %s. Using previous value: %s",
+                           gui_key, full_opc_path, getattr(self, GLOBAL_HANDSHAKE_ATTRS[gui_key]))
+        if self._plc_data_changed is not None:
+            self._plc_data_changed.set()
+
+    async def _run_io(self, coro):
+        """Runs coro on the OPC UA IO loop and awaits its result from the GUI loop."""
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self._io_loop))
+
+    @staticmethod
+    async def _create_io_task(coro, done_callback=None):
+        """Starts coro as a task on the loop it is awaited from (used via _run_io to start IO loop tasks)."""
+        task = asyncio.create_task(coro)
+        if done_callback is not None:
+            task.add_done_callback(done_callback)
+        return task
+
+    @staticmethod
+    async def _cancel_io_task(task):
+        """Cancels a task and waits until it has finished (used via _run_io for IO loop tasks). None is a no-op."""
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def shutdown_io(self):
+        """Stops the PLC tasks, disconnects the OPC UA client and stops the IO loop thread. Safe to call twice."""
+        if self._io_shutdown_started:
+            return
+        self._io_shutdown_started = True
+        self.is_connected = False
+        # Both tasks are stopped concurrently, so their cleanup round trips to the server overlap
+        results = await asyncio.gather(
+            *(asyncio.wait_for(self._run_io(self._cancel_io_task(task)), timeout=IO_SHUTDOWN_TIMEOUT_S)
+              for task in (self.monitoring_task, self.watchdog_task)),
+            return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Error stopping PLC task during shutdown: {result!r}")
+        self.monitoring_task = None
+        self.watchdog_task = None
+        # Also when the client already lost its connection: disconnect() then waits until the dead session is closed
+        try:
+            # shield: a timeout only stops waiting here; the disconnect itself still completes on the IO loop if it can
+            await asyncio.wait_for(asyncio.shield(self._run_io(self.opcua_client.disconnect())), timeout=IO_SHUTDOWN_TIMEOUT_S)
+        except asyncio.TimeoutError:
+            logger.warning(f"OPC UA disconnect did not finish within {IO_SHUTDOWN_TIMEOUT_S} s; closing anyway.")
+        except Exception as e:
+            logger.error(f"Error during OPC UA disconnect: {e}", exc_info=True)
+        self._io_loop.call_soon_threadsafe(self._io_loop.stop)
+        await asyncio.to_thread(self._io_thread.join, IO_SHUTDOWN_TIMEOUT_S)
+        if self._io_thread.is_alive():
+            logger.warning("OPC UA IO thread did not stop in time; leaving it to exit with the process (daemon).")
+            return
+        self._io_loop.close()
+        logger.info("OPC UA IO loop stopped.")
+
+    async def _poll_plc_data(self):
+        """Reads all monitored variables in one batched request. Only used when no subscription could be created."""
+        try:
+            values = await asyncio.wait_for(self.opcua_client.read_variables(self._monitor_targets),
+                                            timeout=PLC_POLL_READ_TIMEOUT_S)
+        except asyncio.TimeoutError:
+            # A stalled server must not stall the monitor; the next poll retries and the watchdog reports a dead link
+            logger.warning("Polling the PLC timed out after %.1f s; keeping the previous values.", PLC_POLL_READ_TIMEOUT_S)
+            return
+        for full_opc_path, value in zip(self._monitor_targets, values):
+            self._store_plc_value(full_opc_path, value)
+
     async def _monitor_plc(self):
-        """Periodically reads data from the PLC and updates the GUI."""
-        vars_to_read_map = {
-            # ... (andere variabelen blijven hetzelfde) ...
-            "iCycle": ("StationData", "iCycle"),
-            "iStationStatus": ("StationData", "iStationStatus"),
-            "sSeq_Step_comment": ("Elevator", "sSeq_Step_comment"), 
-            "iCancelAssignmentReasonCode": ("StationData", "iCancelAssignment"),
-            "sErrorShortDescription": ("StationData", "sShortAlarmDescription"),
-            "sErrorSolution": ("StationData", "sAlarmSolution"),
-            "iElevatorRowLocation": ("Elevator", "iElevatorRowLocation"), 
-            "xTrayInElevator": ("Elevator", "xTrayInElevator"),           
-            "iCurrentForkSide": ("Elevator", "iCurrentForkSide"),         
-            "iErrorCode": ("Elevator", "iErrorCode"),                   
-            
-            # Actieve job parameters van de PLC (gepubliceerd door PLC)
-            # "ActiveTask", "ActiveOrigin", "ActiveDest" zijn VERWIJDERD omdat we deze nu uit de lokale cache halen
-        }
+        """Keeps the PLC data cache up to date and periodically queues snapshots of it for the GUI.
 
+        Runs on the IO loop and never touches Tk. Values are pushed by an OPC UA subscription and the loop only wakes
+        up when one arrives; if the server does not accept a subscription we fall back to polling.
+        """
+        self._plc_data_changed = asyncio.Event()
+        self._poll_requested = asyncio.Event()
+        self._dirty_lifts.update(LIFTS) # Always hand the GUI a first snapshot
+        self._subscription_lost = False
+        subscription = await self.opcua_client.subscribe_data_change(self._monitor_targets, self._store_plc_value,
+                                                                     period_ms=PLC_SUBSCRIPTION_PUBLISH_INTERVAL_MS,
+                                                                     sampling_intervals_ms=self._sampling_intervals_ms,
+                                                                     status_callback=self._on_subscription_status)
+        if subscription is None:
+            logger.warning("Could not subscribe to PLC variables. Falling back to polling.")
+
+        try:
+            while self.is_connected:
+                try:
+                    if subscription is None:
+                        await self._poll_plc_data()
+                    else:
+                        await self._plc_data_changed.wait()
+                        await asyncio.sleep(PLC_CHANGE_COALESCE_S) # Let a burst of notifications land in one snapshot
+                    self._plc_data_changed.clear()
+
+                    # Log changes in global acknowledge state
+                    current_global_ack_requested = self.global_handshake_job_type > 0
+                    if current_global_ack_requested and not self._prev_global_ack_state:
+                        logger.info(f"Global Acknowledge requested by PLC (iJobType={self.global_handshake_job_type}, iRowNr={self.global_handshake_row_nr}).")
+                    elif not current_global_ack_requested and self._prev_global_ack_state:
+                        logger.info(f"Global Acknowledge condition cleared by PLC (iJobType={self.global_handshake_job_type}).")
+                    self._prev_global_ack_state = current_global_ack_requested
+
+                    # Hand one snapshot of all changed lifts to the GUI; the Tk side applies it in _apply_gui_snapshot
+                    if self._dirty_lifts:
+                        self._post_gui_snapshot(self._dirty_lifts)
+                        self._dirty_lifts.clear()
+
+                    if self._subscription_lost:
+                        logger.error("PLC monitoring stopped: the subscription was lost. Reconnect to resume.")
+                        break
+
+                    if subscription is None:
+                        try:
+                            await asyncio.wait_for(self._poll_requested.wait(), timeout=PLC_POLL_INTERVAL_S)
+                        except asyncio.TimeoutError:
+                            pass
+                        self._poll_requested.clear()
+                except asyncio.CancelledError:
+                    logger.info("PLC monitoring task was cancelled.")
+                    break
+                except Exception as e:
+                    logger.error(f"Error in PLC monitoring loop: {e}", exc_info=True)
+                    # Decide if we should stop monitoring or just log and continue
+                    await asyncio.sleep(2) # Wait a bit longer after a major error
+        finally:
+            self._plc_data_changed = None
+            self._poll_requested = None
+            if subscription is not None:
+                await self.opcua_client.delete_subscription(subscription)
+        logger.info("PLC monitoring stopped.")
+
+    def _on_subscription_status(self, status_code):
+        """Subscription status change (IO loop). A bad status means no more values will arrive: the monitored lift values
+        are marked as failed reads, so the GUI shows "ErrorRead" instead of stale data, and the monitor stops."""
+        if status_code.is_good():
+            return
+        self._subscription_lost = True
+        for full_opc_path, (lift_id, _) in self._monitor_targets.items():
+            if lift_id is not None:
+                self._store_plc_value(full_opc_path, None)
+        if self._plc_data_changed is not None:
+            self._plc_data_changed.set() # Wake the monitor even if every value already was None
+
+    def _request_plc_refresh(self):
+        """Lets a polling monitor read the PLC right away instead of at its next interval, e.g. after a user command.
+
+        Without effect when a subscription is active, since the server then pushes the resulting changes itself.
+        """
+        poll_requested = self._poll_requested
+        if poll_requested is not None:
+            self._io_loop.call_soon_threadsafe(poll_requested.set)
+
+    async def _watchdog_loop(self):
+        """Pulses xWatchDog to the PLC; the PLC acknowledges each pulse by resetting it to False.
+
+        A failed pulse is retried at the next interval; after WATCHDOG_MAX_FAILED_PULSES in a row the loop gives up
+        with a ConnectionError.
+        """
+        failed_pulses = 0
         while self.is_connected:
-            try:
-                any_update_failed = False
-                for lift_id in LIFTS: 
-                    current_lift_data = self.all_lift_data_cache.get(lift_id, {}).copy()
-                    station_idx_for_opc = self._get_station_index(lift_id)
-                    elevator_id_str = self._get_elevator_identifier(lift_id)
-
-                    if station_idx_for_opc is None or elevator_id_str is None:
-                        logger.error(f"Cannot determine OPC identifiers for GUI lift ID: {lift_id}")
-                        any_update_failed = True
-                        continue
-
-                    for gui_key, (path_type, sub_path_template) in vars_to_read_map.items():
-                        full_opc_path = ""
-                        if path_type == "StationData":
-                            full_opc_path = f"{self.PLC_TO_ECO_BASE}/StationData/{station_idx_for_opc}/{sub_path_template}"
-                        elif path_type == "Elevator":
-                            full_opc_path = f"{self.PLC_TO_ECO_BASE}/{elevator_id_str}/{sub_path_template}"
-                        # Removed "ActiveAssignment" path_type handling as we are not reading active job from PLC for these specific labels
-                        else:
-                            logger.warning(f"Unknown path_type: {path_type} for gui_key: {gui_key}")
-                            any_update_failed = True
-                            continue
-                        
-                        value = await self.opcua_client.read_variable(full_opc_path)
-                        if value is not None:
-                            current_lift_data[gui_key] = value
-                        else:
-                            any_update_failed = True
-                            current_lift_data[gui_key] = None # Explicitly set to None on read failure
-
-                    self.all_lift_data_cache[lift_id] = current_lift_data
-                    # GUI update for lift-specific data will be called after global handshake read
-                    # self._update_gui_for_lift(lift_id, current_lift_data) # Moved down
-
-                # Read Global Handshake Data
-                global_job_type_path = f"{self.PLC_TO_ECO_BASE}/StationDataToEco/ExtraData/Handshake/iJobType"
-                global_row_nr_path = f"{self.PLC_TO_ECO_BASE}/StationDataToEco/ExtraData/Handshake/iRowNr"
-                
-                job_type_val = await self.opcua_client.read_variable(global_job_type_path)
-                row_nr_val = await self.opcua_client.read_variable(global_row_nr_path)
+            success = await self.opcua_client.write_value(self._watchdog_path, True, ua.VariantType.Boolean)
+            if success:
+                if failed_pulses:
+                    logger.info("Watchdog pulse to %s succeeded again after %d failed pulses.", self._watchdog_path, failed_pulses)
+                failed_pulses = 0
+            else:
+                failed_pulses += 1
+                if failed_pulses == 1: # Warned once per streak of failures, not on every retry
+                    logger.warning("Failed to write watchdog to %s; retrying every %.1f s.", self._watchdog_path, WATCHDOG_INTERVAL_S)
+                if failed_pulses >= WATCHDOG_MAX_FAILED_PULSES:
+                    raise ConnectionError(f"Failed to write watchdog to {self._watchdog_path} {failed_pulses} times in a row")
+            await asyncio.sleep(WATCHDOG_INTERVAL_S)
+
+    def _on_watchdog_task_done(self, task):
+        """Runs on the IO loop when the watchdog stops. If it gave up, the GUI loop tears down the connection."""
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            logger.error(f"Watchdog task stopped: {exc}")
+            self._gui_loop.call_soon_threadsafe(self._on_watchdog_lost, task)
+
+    def _on_watchdog_lost(self, task):
+        """GUI loop: the PLC no longer receives watchdog pulses, so the connection is shown as lost and torn down."""
+        if task is not self.watchdog_task or not self.is_connected:
+            return # Already disconnected, or a new connection has its own watchdog
+        self.watchdog_task = None # Its failure was logged; disconnect_plc need not cancel it
+        asyncio.create_task(self._disconnect_after_connection_loss())
+
+    async def _disconnect_after_connection_loss(self):
+        await self.disconnect_plc()
+        self._update_connection_status(False, "Status: Connection lost", "red")
+        self.update_system_stack_light('error')
+
+    def _post_gui_snapshot(self, lift_ids):
+        """Copies the cached PLC data of lift_ids into the snapshot the GUI draws next, replacing older data of those lifts.
+
+        Each lift's data is copied because the GUI keeps the last drawn snapshot to compare against.
+        """
+        with self._gui_snapshot_lock:
+            for lift_id in lift_ids:
+                self._pending_gui_snapshot[lift_id] = dict(self.all_lift_data_cache.get(lift_id, {}))
+            if self._gui_refresh_scheduled:
+                return # The GUI has not drawn the previous snapshot yet and picks this data up with it
+            self._gui_refresh_scheduled = True
+        self._gui_loop.call_soon_threadsafe(self._schedule_gui_refresh)
+
+    def _schedule_gui_refresh(self):
+        """Runs on the GUI loop: draws the pending snapshot once Tk is idle. Snapshots posted before then share the redraw."""
+        try:
+            self.root.after_idle(self._apply_gui_snapshot)
+        except tk.TclError:
+            pass # Window already destroyed
 
-                if job_type_val is not None:
-                    self.global_handshake_job_type = self._safe_get_int_from_data({'val': job_type_val}, 'val', default=0)
-                else:
-                    logger.warning(f"Failed to read global iJobType from {global_job_type_path}. Using previous value: {self.global_handshake_job_type}")
-                    any_update_failed = True
-                
-                if row_nr_val is not None:
-                    self.global_handshake_row_nr = self._safe_get_int_from_data({'val': row_nr_val}, 'val', default=0)
-                else:
-                    logger.warning(f"Failed to read global iRowNr from {global_row_nr_path}. Using previous value: {self.global_handshake_row_nr}")
-                    any_update_failed = True
-
-                # Log changes in global acknowledge state
-                current_global_ack_requested = self.global_handshake_job_type > 0
-                if current_global_ack_requested and not self._prev_global_ack_state:
-                    logger.info(f"Global Acknowledge requested by PLC (iJobType={self.global_handshake_job_type}, iRowNr={self.global_handshake_row_nr}).")
-                elif not current_global_ack_requested and self._prev_global_ack_state:
-                    logger.info(f"Global Acknowledge condition cleared by PLC (iJobType={self.global_handshake_job_type}).")
-                self._prev_global_ack_state = current_global_ack_requested
-
-                # Now update GUI for all lifts, including the global handshake status
-                for lift_id in LIFTS:
-                    self._update_gui_for_lift(lift_id, self.all_lift_data_cache.get(lift_id, {}))
+    def _clear_gui_snapshot(self):
+        """Drops the pending GUI snapshot, e.g. after a disconnect reset the labels."""
+        with self._gui_snapshot_lock:
+            self._pending_gui_snapshot.clear()
 
-                self._determine_and_update_global_stack_light()
-                if any_update_failed:
-                    pass
-                
-                await asyncio.sleep(0.25)
-            except asyncio.CancelledError:
-                logger.info("PLC monitoring task was cancelled.")
-                break
+    def _apply_gui_snapshot(self):
+        """Tk timer callback: draws the pending PLC snapshot of all changed lifts in one pass.
+
+        Reschedules itself only while a lift animation has not reached the drawn row yet.
+        """
+        if not self.root.winfo_exists(): return
+
+        with self._gui_snapshot_lock:
+            latest_per_lift, self._pending_gui_snapshot = self._pending_gui_snapshot, self._spare_gui_snapshot
+            self._gui_refresh_scheduled = False
+
+        # A lift still animating towards an earlier row target needs a redraw even without new PLC data
+        for lift_id, (plc_data, _) in self._last_drawn_state.items():
+            if lift_id not in latest_per_lift:
+                row = self._safe_get_int_from_data(plc_data, "iElevatorRowLocation", default=1)
+                if not self._lift_visual_settled(lift_id, row):
+                    latest_per_lift[lift_id] = plc_data
+
+        # Skip lifts whose PLC data and the global handshake did not change since the last draw
+        handshake = (self.global_handshake_job_type, self.global_handshake_row_nr)
+        changed_lifts = []
+        stack_light_dirty = False # Animation-only redraws cannot change the system state
+        for lift_id, plc_data in latest_per_lift.items():
+            state = (plc_data, handshake)
+            row = self._safe_get_int_from_data(plc_data, "iElevatorRowLocation", default=1)
+            if self._last_drawn_state.get(lift_id) != state:
+                self._last_drawn_state[lift_id] = state
+                stack_light_dirty = True
+                changed_lifts.append((lift_id, plc_data))
+            elif not self._lift_visual_settled(lift_id, row):
+                changed_lifts.append((lift_id, plc_data))
+
+        if changed_lifts:
+            try:
+                for lift_id, plc_data in changed_lifts:
+                    self._update_gui_for_lift(lift_id, plc_data)
+                if stack_light_dirty:
+                    self._determine_and_update_global_stack_light()
             except Exception as e:
-                logger.error(f"Error in PLC monitoring loop: {e}", exc_info=True)
-                # Decide if we should stop monitoring or just log and continue
-                await asyncio.sleep(2) # Wait a bit longer after a major error
-        logger.info("PLC monitoring stopped.")
+                logger.error(f"Error applying PLC data to GUI: {e}", exc_info=True)
+
+        # Follow up only for lifts whose animation is still under way after this draw
+        animation_pending = False
+        for lift_id, plc_data in changed_lifts:
+            row = self._safe_get_int_from_data(plc_data, "iElevatorRowLocation", default=1)
+            if not self._lift_visual_settled(lift_id, row):
+                animation_pending = True
+                break
+
+        latest_per_lift.clear()
+        self._spare_gui_snapshot = latest_per_lift
+        if animation_pending:
+            with self._gui_snapshot_lock:
+                if self._gui_refresh_scheduled:
+                    return # Snapshots arrived during this draw; the monitor already scheduled the next refresh
+                self._gui_refresh_scheduled = True
+            self.root.after(GUI_REFRESH_INTERVAL_MS, self._apply_gui_snapshot)
 
     def _update_gui_for_lift(self, lift_id: str, lift_data: dict):
         """Updates all relevant GUI elements for a specific lift based on new data."""
         if not self.root.winfo_exists(): return
 
-        # Update status labels (including last sent job parameters from cache)
-        status_labels_to_update = [
-            "iCycle", "iStationStatus", "iElevatorRowLocation", "xTrayInElevator", 
-            "iCurrentForkSide", "iTaskType", "iOrigination", "iDestination"
-        ]
-        # Map GUI label names for sent parameters to their cache keys
-        sent_param_cache_map = {
-            "iTaskType": "SentTaskType",
-            "iOrigination": "SentOrigin",
-            "iDestination": "SentDestination"
-        }
+        # Bind the per-lift widget dicts and hot methods once instead of looking them up per statement
+        labels = self.status_labels.get(lift_id, {})
+        set_label_text = self._set_status_label_text
+        section_changed = self._section_changed
+        safe_int = self._safe_int
+        get = lift_data.get
+        last_values = self._last_label_values[lift_id]
+
+        # Update sSeq_Step_comment history; its Text widget only while the lift's tab is shown
+        is_visible = lift_id == self._visible_lift
+        comment_widget = labels.get("sSeq_Step_comment")
+        if comment_widget is not None:
+            history = self.seq_step_history[lift_id]
+            new_comment = get("sSeq_Step_comment", "ErrorRead")
+            if new_comment != history[0] if history else True:
+                new_line = new_comment if new_comment is not None else ""
+                history.appendleft(new_line)
+                if not is_visible:
+                    self._stale_step_comments.add(lift_id)
+                elif len(history) == 1:
+                    self._set_text(comment_widget, new_line) # Replaces the "N/A" placeholder
+                else:
+                    self._prepend_text_line(comment_widget, new_line, history.maxlen)
 
-        for var_name in status_labels_to_update:
-            if lift_id in self.status_labels and var_name in self.status_labels[lift_id]:
-                value = "N/A" # Default
-                if var_name in sent_param_cache_map: # Check if it's one of the sent parameters
-                    cache_key = sent_param_cache_map[var_name]
-                    value = self.last_sent_job_params.get(lift_id, {}).get(cache_key, "N/A")
-                    if value == "N/A" and not self.last_sent_job_params.get(lift_id):
-                         display_value = "N/A (No job sent)"
-                    else:
-                        display_value = str(value)
-                else: # Handle values read from PLC
-                    plc_value = lift_data.get(var_name)
-                    display_value = str(plc_value) if plc_value is not None else "ErrorRead"
-                
-                self.status_labels[lift_id][var_name].config(text=display_value)
-        
-        # Update sSeq_Step_comment (Text widget)
-        if lift_id in self.status_labels and "sSeq_Step_comment" in self.status_labels[lift_id]:
-            comment_widget = self.status_labels[lift_id]["sSeq_Step_comment"]
-            new_comment = lift_data.get("sSeq_Step_comment", "ErrorRead")
-            if new_comment != self.seq_step_history[lift_id][0] if self.seq_step_history[lift_id] else True:
-                self.seq_step_history[lift_id].appendleft(new_comment if new_comment is not None else "")
-                comment_widget.config(state=tk.NORMAL)
-                comment_widget.delete("1.0", tk.END)
-                comment_widget.insert("1.0", "\n".join(self.seq_step_history[lift_id]))
-                comment_widget.config(state=tk.DISABLED)
-
-        tray_present_plc = lift_data.get("xTrayInElevator")
+        tray_present_plc = get("xTrayInElevator")
         if tray_present_plc is not None:
             self.lift_tray_status[lift_id] = bool(tray_present_plc)
 
-        current_row_for_vis = self._safe_get_int_from_data(lift_data, "iElevatorRowLocation", default=1)
-        has_tray_for_vis = bool(lift_data.get("xTrayInElevator", False))
-        fork_side_for_vis = self._safe_get_int_from_data(lift_data, "iCurrentForkSide", default=0)
-        is_error_for_vis = self._safe_get_int_from_data(lift_data, "iErrorCode", default=0) != 0
+        current_row_for_vis = safe_int(get("iElevatorRowLocation"), default=1)
+        has_tray_for_vis = bool(tray_present_plc)
+        fork_side_for_vis = safe_int(get("iCurrentForkSide"), default=0)
+        error_code = get("iErrorCode")
+        is_error_for_vis = safe_int(error_code, default=0) != 0
+        vis_state = (current_row_for_vis, has_tray_for_vis, fork_side_for_vis, is_error_for_vis)
         
-        if self.lift_vis_manager:
+        # Repaint only on a visual change, or while the lift has not yet animated to the requested row
+        if self.lift_vis_manager and (section_changed(lift_id, "vis", vis_state)
+                                      or not self._lift_visual_settled(lift_id, current_row_for_vis)):
             try:
                 self.lift_vis_manager.update_lift_visual_state(
                     lift_id,
@@ -691,95 +1076,163 @@ class EcoSystemGUI_DualLift_ST:
             except Exception as e:
                 logger.error(f"Error calling update_lift_visual_state for {lift_id}: {e}")
 
+        # The shared canvas shows every lift, but the widgets below live on this lift's tab; a hidden tab is
+        # redrawn from the last snapshot when it gets selected (_on_lift_tab_changed)
+        if not is_visible:
+            return
+
+        # Update status labels: values read from PLC (formatted only when they changed), then the last sent job parameters from cache
+        for var_name in PLC_STATUS_LABEL_VARS:
+            plc_value = get(var_name)
+            if var_name in last_values and last_values[var_name] == plc_value:
+                continue
+            last_values[var_name] = plc_value
+            set_label_text(lift_id, var_name, str(plc_value) if plc_value is not None else "ErrorRead")
+
+        self._update_sent_param_labels(lift_id)
+        
         # Update Handshake/Acknowledge section using GLOBAL handshake data
-        if lift_id in self.ack_controls:
+        ack = self.ack_controls.get(lift_id)
+        if ack is not None and section_changed(lift_id, "ack", (self.global_handshake_job_type, self.global_handshake_row_nr)):
             # ack_type = self._safe_get_int_from_data(lift_data, "iJobType") # OLD: per-lift
-            ack_button = self.ack_controls[lift_id]['ack_movement_button']
-            ack_label = self.ack_controls[lift_id]['ack_info_label']
+            ack_button = ack['ack_movement_button']
+            ack_label = ack['ack_info_label']
             
             # prev_ack_state = getattr(self, f"_prev_ack_state_{lift_id}", None) # OLD: per-lift tracking
 
             if self.global_handshake_job_type > 0:
                 # Logging is now done in _monitor_plc based on _prev_global_ack_state
-                ack_label.config(text=f"PLC Awaiting Global Ack (Type: {self.global_handshake_job_type}, Row: {self.global_handshake_row_nr})", foreground="blue")
+                self._set_label(ack_label, f"PLC Awaiting Global Ack (Type: {self.global_handshake_job_type}, Row: {self.global_handshake_row_nr})", "blue")
                 ack_button.config(state=tk.NORMAL)
                 # setattr(self, f"_prev_ack_state_{lift_id}", True) # OLD
             else:
                 # Logging is now done in _monitor_plc
-                ack_label.config(text="PLC Awaiting Ack: No", foreground="grey")
+                self._set_label(ack_label, "PLC Awaiting Ack: No", "grey")
                 ack_button.config(state=tk.DISABLED)
                 # setattr(self, f"_prev_ack_state_{lift_id}", False) # OLD
 
-        self._update_error_display(lift_id, lift_data) 
+        error_state = (error_code, get("sErrorShortDescription"), get("sErrorMessage"), get("sErrorSolution"))
+        if section_changed(lift_id, "error", error_state):
+            self._update_error_display(lift_id, lift_data)
+
+        if "iCancelAssignmentReasonCode" in labels:
+            reason_code = safe_int(get("iCancelAssignmentReasonCode"))
+            if section_changed(lift_id, "cancel", (reason_code,)): # Format and look up the reason only for a new code
+                set_label_text(lift_id, "iCancelAssignmentReasonCode", str(reason_code))
+                reason_text = CANCEL_REASON_TEXTS.get(reason_code, "Unknown or Invalid Code")
+                set_label_text(lift_id, "sCancelAssignmentReasonText", reason_text)
+
+    def _update_sent_param_labels(self, lift_id: str):
+        """Shows the last sent job parameters of a lift in its status labels."""
+        sent_params = self.last_sent_job_params.get(lift_id)
+        for var_name, cache_key in SENT_PARAM_LABEL_KEYS:
+            self._set_status_label_text(lift_id, var_name, str(sent_params.get(cache_key, "N/A")) if sent_params else "N/A (No job sent)")
+
+    def _section_changed(self, lift_id: str, section: str, state: tuple) -> bool:
+        """Records state as the last drawn state of a GUI section and tells whether it differs from the previous one."""
+        last_state = self._last_section_state[lift_id]
+        if last_state.get(section) == state:
+            return False
+        last_state[section] = state
+        return True
+
+    def _lift_visual_settled(self, lift_id: str, row: int) -> bool:
+        """True if the visualization shows the lift at row with no animation still running."""
+        vis = self.lift_vis_manager
+        return not vis.animation_running.get(lift_id, False) and vis.last_position.get(lift_id) == row
+
+    def _set_text(self, widget, text: str):
+        """Replaces the content of a read-only Text widget, skipping the Tk calls if it already shows that text."""
+        if self._last_text.get(widget) == text:
+            return
+        widget.config(state=tk.NORMAL)
+        widget.delete("1.0", tk.END)
+        widget.insert("1.0", text)
+        widget.config(state=tk.DISABLED)
+        self._last_text[widget] = text
+
+    def _set_label(self, widget, text: str, foreground: str):
+        """Sets text and color of a label, skipping the Tk call if it already shows them."""
+        if self._last_text.get(widget) == (text, foreground):
+            return
+        widget.config(text=text, foreground=foreground)
+        self._last_text[widget] = (text, foreground)
+
+    def _prepend_text_line(self, widget, line: str, max_lines: int):
+        """Inserts line at the top of a read-only Text widget and drops the lines beyond max_lines, leaving the rest untouched."""
+        widget.config(state=tk.NORMAL)
+        widget.insert("1.0", line + "\n")
+        widget.delete(f"{max_lines}.end", tk.END)
+        widget.config(state=tk.DISABLED)
+        self._last_text.pop(widget, None) # Content no longer matches what _set_text last wrote
 
-        if lift_id in self.status_labels and "iCancelAssignmentReasonCode" in self.status_labels[lift_id]:
-            reason_code = self._safe_get_int_from_data(lift_data, "iCancelAssignmentReasonCode")
-            self.status_labels[lift_id]["iCancelAssignmentReasonCode"].config(text=str(reason_code))
-            reason_text = CANCEL_REASON_TEXTS.get(reason_code, "Unknown or Invalid Code")
-            self.status_labels[lift_id]["sCancelAssignmentReasonText"].config(text=reason_text)
+    def _set_status_label_text(self, lift_id: str, var_name: str, text: str):
+        """Sets the text of a status label, skipping the Tk call if the label already shows that text."""
+        last_displayed = self._last_displayed[lift_id]
+        if last_displayed.get(var_name) != text:
+            last_displayed[var_name] = text
+            self.status_label_vars[lift_id][var_name].set(text)
 
 
     def _safe_get_int_from_data(self, data_dict, key, default=0):
         """Safely gets an integer from a dictionary, handling potential errors."""
+        return self._safe_int(data_dict.get(key), default)
+
+    @staticmethod
+    def _safe_int(value, default=0):
+        """Converts a PLC value to int; default for None or values that cannot be converted."""
+        if type(value) is int: # PLC integers arrive as int; skip the conversion path
+            return value
+        if value is None: # Missing key or failed read
+            return default
         try:
-            value = data_dict.get(key)
-            if value is None:
-                # logger.debug(f"Key '{key}' not found in data. Using default: {default}")
-                return default
             return int(value)
         except (ValueError, TypeError):
-            # logger.warning(f"Could not convert value for key '{key}' to int. Value: {repr(value)}. Using default: {default}")
+            # logger.warning(f"Could not convert value {repr(value)} to int. Using default: {default}")
             return default
 
     def _update_error_display(self, lift_id, error_data):
         """Updates the error display section for a lift based on error_data from PLC."""
-        if lift_id not in self.error_controls:
+        controls = self.error_controls.get(lift_id)
+        if controls is None:
             logger.warning(f"_update_error_display: No error controls found for {lift_id}")
             return
 
-        controls = self.error_controls[lift_id]
-        error_code = self._safe_get_int_from_data(error_data, "iErrorCode") # Use safe_get
+        error_code = self._safe_int(error_data.get("iErrorCode"))
+        set_label = self._set_label
 
         if error_code != 0:
-            controls['error_status_label'].config(text=f"PLC Error State: Yes ({error_code})", foreground="red")
-            controls['short_description'].config(text=error_data.get("sErrorShortDescription", "Unknown"), foreground="red")
-            
-            for widget_key, data_key in [('message', "sErrorMessage"), ('solution', "sErrorSolution")]:
-                text_widget = controls.get(widget_key)
-                if text_widget:
-                    text_widget.config(state=tk.NORMAL)
-                    text_widget.delete("1.0", tk.END)
-                    text_widget.insert("1.0", error_data.get(data_key, "No details." if widget_key == 'message' else "No solution provided."))
-                    text_widget.config(state=tk.DISABLED)
+            set_label(controls['error_status_label'], f"PLC Error State: Yes ({error_code})", "red")
+            set_label(controls['short_description'], error_data.get("sErrorShortDescription", "Unknown"), "red")
+            message = error_data.get("sErrorMessage", "No details.")
+            solution = error_data.get("sErrorSolution", "No solution provided.")
         else:
-            controls['error_status_label'].config(text="PLC Error State: No", foreground="green")
-            controls['short_description'].config(text="None", foreground="gray")
-
-            for widget_key in ['message', 'solution']:
-                text_widget = controls.get(widget_key)
-                if text_widget:
-                    text_widget.config(state=tk.NORMAL)
-                    text_widget.delete("1.0", tk.END)
-                    text_widget.insert("1.0", "N/A")
-                    text_widget.config(state=tk.DISABLED)
+            set_label(controls['error_status_label'], "PLC Error State: No", "green")
+            set_label(controls['short_description'], "None", "gray")
+            message = solution = "N/A"
+
+        message_widget = controls.get('message')
+        if message_widget:
+            self._set_text(message_widget, message)
+        solution_widget = controls.get('solution')
+        if solution_widget:
+            self._set_text(solution_widget, solution)
         # logger.debug(f"Error display updated for {lift_id}: Code {error_code}")
 
 
     async def connect_plc(self):
         endpoint_url = self.endpoint_var.get()
         logger.info(f"Attempting to connect to PLC at {endpoint_url}...")
-        self.connection_status_label.config(text="Status: Connecting...", foreground="orange")
+        self._update_connection_status(None, "Status: Connecting...", "orange")
         self.update_system_stack_light('busy') 
 
         try:
             self.opcua_client.endpoint_url = endpoint_url # Ensure the client uses the potentially updated endpoint URL
-            connection_successful = await self.opcua_client.connect() 
+            connection_successful = await self._run_io(self.opcua_client.connect())
 
             if connection_successful:
                 self.is_connected = True
-                self.connection_status_label.config(text="Status: Connected", foreground="green")
-                self.connect_button.config(state=tk.DISABLED)
-                self.disconnect_button.config(state=tk.NORMAL)
+                self._update_connection_status(True, "Status: Connected", "green")
                 
                 for lift_id in LIFTS:
                     if lift_id in self.job_controls:
@@ -787,26 +1240,33 @@ class EcoSystemGUI_DualLift_ST:
                         self.job_controls[lift_id]['clear_task_button'].config(state=tk.NORMAL)
                 # ack_controls button state is typically managed by _monitor_plc based on PLC state
 
+                # Resolve all monitored and written paths to NodeIds in one request, so no read or write browses per path
+                paths_to_resolve = list(self._monitor_targets) + [self._watchdog_path]
+                for write_paths in self._lift_write_paths.values():
+                    paths_to_resolve.extend(write_paths.values())
+                await self._run_io(self.opcua_client.resolve_nodes(paths_to_resolve))
+
                 # Clear job inputs on OPC server for all lifts to prevent immediate job start
                 logger.info("Connection successful. Resetting job inputs on OPC server for all lifts...")
-                for lift_id_to_clear in LIFTS:
-                    await self._reset_job_inputs_on_server_for_lift(lift_id_to_clear)
+                # The lifts are independent, so their resets run concurrently on the one OPC UA session
+                await asyncio.gather(*(self._reset_job_inputs_on_server_for_lift(lift_id_to_clear) for lift_id_to_clear in LIFTS))
                 logger.info("Finished resetting job inputs on OPC server for all lifts.")
 
                 logger.info(f"Successfully connected to PLC at {endpoint_url}.")
                 self.update_system_stack_light('connected_idle')
 
                 if self.monitoring_task:
-                    self.monitoring_task.cancel()
                     try:
-                        await self.monitoring_task
-                    except asyncio.CancelledError:
+                        await self._run_io(self._cancel_io_task(self.monitoring_task))
                         logger.info("Previous monitoring task cancelled before starting new one.")
                     except Exception as e_task_cancel:
                         logger.error(f"Error awaiting previous monitoring task cancellation: {e_task_cancel}")
 
+                if self.watchdog_task is None or self.watchdog_task.done():
+                    self.watchdog_task = await self._run_io(self._create_io_task(self._watchdog_loop(), self._on_watchdog_task_done))
+
                 if hasattr(self, '_monitor_plc') and callable(self._monitor_plc):
-                    self.monitoring_task = asyncio.create_task(self._monitor_plc())
+                    self.monitoring_task = await self._run_io(self._create_io_task(self._monitor_plc()))
                     logger.info("PLC monitoring task started.")
                 else:
                     logger.error("CRITICAL: _monitor_plc method is not defined. GUI will not update PLC data.")
@@ -816,47 +1276,60 @@ class EcoSystemGUI_DualLift_ST:
                 # Connection failed as reported by opcua_client.connect()
                 self.is_connected = False
                 logger.error(f"Failed to connect to PLC at {endpoint_url} (opcua_client.connect returned False).")
-                self.connection_status_label.config(text="Status: Connection Failed", foreground="red")
+                self._update_connection_status(False, "Status: Connection Failed", "red")
                 messagebox.showerror("Connection Error", f"Could not connect to PLC at {endpoint_url}. Check logs.")
                 self.update_system_stack_light('error') 
-                self.connect_button.config(state=tk.NORMAL)
-                self.disconnect_button.config(state=tk.DISABLED)
 
         except Exception as e:
             self.is_connected = False
             logger.error(f"Failed to connect to PLC: {e}", exc_info=True)
-            self.connection_status_label.config(text=f"Status: Error - Check Logs", foreground="red")
+            self._update_connection_status(False, "Status: Error - Check Logs", "red")
             messagebox.showerror("Connection Error", f"Could not connect to PLC: {e}")
             self.update_system_stack_light('error') 
-            self.connect_button.config(state=tk.NORMAL)
-            self.disconnect_button.config(state=tk.DISABLED)
+
+    def _update_connection_status(self, connected, text, foreground):
+        """Shows the connection state in the label and connect/disconnect buttons (connected=None leaves the buttons).
+
+        Skips all Tk calls when the state is the one already shown.
+        """
+        status = (connected, text, foreground)
+        if status == self._connection_status:
+            return
+        self._connection_status = status
+        self.connection_status_label.config(text=text, foreground=foreground)
+        if connected is not None:
+            self.connect_button.config(state=tk.DISABLED if connected else tk.NORMAL)
+            self.disconnect_button.config(state=tk.NORMAL if connected else tk.DISABLED)
 
     async def disconnect_plc(self):
+        if not self.is_connected and self.monitoring_task is None and self.watchdog_task is None:
+            logger.info("Disconnect requested while already disconnected; nothing to do.")
+            return
         logger.info("Attempting to disconnect from PLC...")
         self.update_system_stack_light('busy')
 
-        if self.monitoring_task:
-            logger.info("Cancelling PLC monitoring task...")
-            self.monitoring_task.cancel()
-            try:
-                await self.monitoring_task 
-            except asyncio.CancelledError:
+        if self.monitoring_task or self.watchdog_task:
+            logger.info("Cancelling PLC monitoring and watchdog tasks...")
+            # Stopped concurrently: the monitor's subscription cleanup is a server round trip the watchdog need not wait for
+            monitor_result, _ = await asyncio.gather(
+                self._run_io(self._cancel_io_task(self.monitoring_task)),
+                self._run_io(self._cancel_io_task(self.watchdog_task)), # Failures were already logged by _on_watchdog_task_done
+                return_exceptions=True)
+            if isinstance(monitor_result, Exception):
+                logger.error(f"Error during monitoring task cancellation: {monitor_result}", exc_info=monitor_result)
+            elif self.monitoring_task:
                 logger.info("Monitoring task successfully cancelled.")
-            except Exception as e:
-                logger.error(f"Error during monitoring task cancellation: {e}", exc_info=True)
             self.monitoring_task = None
+            self.watchdog_task = None
+        self._clear_gui_snapshot() # Stale snapshots must not overwrite the reset below
+        self._last_drawn_state.clear() # Redraw everything after a reconnect
         
-        if self.opcua_client and self.opcua_client.is_connected:
-            try:
-                await self.opcua_client.disconnect()
-                logger.info("Successfully disconnected from PLC.")
-            except Exception as e:
-                logger.error(f"Error during OPC UA disconnect: {e}", exc_info=True)
+        # The OPC UA session itself stays open so a reconnect skips the SecureChannel/CreateSession handshake;
+        # it is closed in shutdown_io when the application exits (or by connect() when the endpoint changes)
+        logger.info("Stopped PLC communication. OPC UA session kept open for reconnecting.")
         
         self.is_connected = False
-        self.connection_status_label.config(text="Status: Disconnected", foreground="red")
-        self.connect_button.config(state=tk.NORMAL)
-        self.disconnect_button.config(state=tk.DISABLED)
+        self._update_connection_status(False, "Status: Disconnected", "red")
         
         for lift_id in LIFTS:
             if lift_id in self.job_controls:
@@ -864,38 +1337,41 @@ class EcoSystemGUI_DualLift_ST:
                 self.job_controls[lift_id]['clear_task_button'].config(state=tk.DISABLED)
             if lift_id in self.ack_controls:
                  self.ack_controls[lift_id]['ack_movement_button'].config(state=tk.DISABLED)
-                 self.ack_controls[lift_id]['ack_info_label'].config(text="PLC Awaiting Ack: No", foreground="grey")
-
-            if lift_id in self.status_labels:
-                for var_name, label_widget in self.status_labels[lift_id].items():
-                    if var_name == "sSeq_Step_comment" and isinstance(label_widget, tk.Text):
-                        label_widget.config(state=tk.NORMAL)
-                        label_widget.delete("1.0", tk.END)
-                        label_widget.insert("1.0", "N/A")
-                        label_widget.config(state=tk.DISABLED)
-                    elif isinstance(label_widget, ttk.Label):
-                        label_widget.config(text="N/A")
-            
-            if lift_id in self.error_controls: # Reset error display
-                self._update_error_display(lift_id, {"iErrorCode": 0}) # Pass data that signifies no error
-
-            # Reset visualization for the lift if manager supports it
-            if hasattr(self.lift_vis_manager, 'reset_lift_visualization'):
-                 self.lift_vis_manager.reset_lift_visualization(lift_id)
-            elif hasattr(self.lift_vis_manager, 'update_lift_visualization'): # Or update with default/empty data
-                 self.lift_vis_manager.update_lift_visualization(lift_id, {}, "N/A")
+                 self._set_label(self.ack_controls[lift_id]['ack_info_label'], "PLC Awaiting Ack: No", "grey")
 
+            self._reset_lift_gui_elements(lift_id)
 
         # Clear the last sent job parameters cache on disconnect
         self.last_sent_job_params = {lift_id: {} for lift_id in LIFTS}
-        # Update GUI to reflect cleared sent job parameters
+        # Show the cleared sent job parameters; the rest of each lift was just reset and must not be redrawn from the stale cache
         for lift_id_to_update in LIFTS:
-            self._update_gui_for_lift(lift_id_to_update, self.all_lift_data_cache.get(lift_id_to_update, {}))
+            self._update_sent_param_labels(lift_id_to_update)
 
         self.all_lift_data_cache = {lift_id: {} for lift_id in LIFTS} # Clear cache
         self.update_system_stack_light('off') 
         logger.info("GUI state reset to disconnected.")
 
+    def _reset_lift_gui_elements(self, lift_id):
+        """Resets the status labels, error display and visualization of a lift to their disconnected state."""
+        label_names, comment_widget = self._status_reset_widgets.get(lift_id, ((), None))
+        for var_name in label_names:
+            self._set_status_label_text(lift_id, var_name, "N/A")
+        if comment_widget is not None:
+            self._set_text(comment_widget, "N/A")
+            self.seq_step_history[lift_id].clear() # The next comment replaces "N/A" instead of being prepended to it
+            self._stale_step_comments.discard(lift_id)
+        self._last_section_state[lift_id].clear() # Ack controls were reset by the caller, error display and visualization below
+        self._last_label_values[lift_id].clear() # Labels now show "N/A"; the next PLC values must be formatted again
+        
+        if lift_id in self.error_controls: # Reset error display
+            self._update_error_display(lift_id, NO_ERROR_DATA) # Pass data that signifies no error
+
+        # Reset visualization for the lift if manager supports it
+        if hasattr(self.lift_vis_manager, 'reset_lift_visualization'):
+             self.lift_vis_manager.reset_lift_visualization(lift_id)
+        elif hasattr(self.lift_vis_manager, 'update_lift_visualization'): # Or update with default/empty data
+             self.lift_vis_manager.update_lift_visualization(lift_id, {}, "N/A")
+
     def _on_task_type_change(self, lift_id):
         """Callback when the task type radio button changes."""
         if lift_id not in self.job_controls: return
@@ -935,12 +1411,13 @@ class EcoSystemGUI_DualLift_ST:
 
         async def async_write_tray_status():
             # This path writes to the PLC's output variable, effectively overriding the PLC state.
-            opc_path = f"{self.PLC_TO_ECO_BASE}/{elevator_id}/xTrayInElevator"
-            success = await self.opcua_client.write_value(opc_path, new_tray_status, ua.VariantType.Boolean)
+            opc_path = self._lift_write_paths[lift_id]["xTrayInElevator"]
+            success = await self._run_io(self.opcua_client.write_value(opc_path, new_tray_status, ua.VariantType.Boolean))
             if success:
                 # self.lift_tray_status[lift_id] = new_tray_status # Local state updated by monitor loop from PLC read
                 logger.info(f"Successfully wrote {opc_path} = {new_tray_status} to PLC (overriding PLC state). Waiting for monitor to confirm.")
-                messagebox.showinfo("Tray Status", f"Tray presence for {lift_id} set to: {new_tray_status} on PLC. GUI will update on next read.")
+                self._request_plc_refresh()
+                self._flash_status(f"{lift_id}: tray set to {new_tray_status}")
                 # The GUI will visually update once the _monitor_plc loop reads this new value back.
             else:
                 logger.error(f"Failed to write {opc_path} = {new_tray_status} to PLC.")
@@ -972,8 +1449,8 @@ class EcoSystemGUI_DualLift_ST:
                 "SentOrigin": origin,
                 "SentDestination": destination
             }
-            # Trigger a GUI update for this lift to show the new "Sent" values immediately
-            self._update_gui_for_lift(lift_id, self.all_lift_data_cache.get(lift_id, {}))
+            # Show the new "Sent" values immediately; the PLC side follows with the next snapshot
+            self._update_sent_param_labels(lift_id)
 
         except ValueError:
             messagebox.showerror("Input Error", "Origin and Destination must be valid integers.")
@@ -983,9 +1460,9 @@ class EcoSystemGUI_DualLift_ST:
             return
 
         elevator_id_str = self._get_elevator_identifier(lift_id)
-        station_idx_for_opc_node = self._get_station_index(lift_id) # 0 for Lift1, 1 for Lift2
+        write_paths = self._lift_write_paths.get(lift_id)
 
-        if elevator_id_str is None or station_idx_for_opc_node is None:
+        if elevator_id_str is None or write_paths is None:
             logger.error(f"Cannot determine OPC identifiers for GUI lift ID: {lift_id}")
             messagebox.showerror("Internal Error", "Could not determine OPC identifiers.")
             return
@@ -994,27 +1471,18 @@ class EcoSystemGUI_DualLift_ST:
 
         async def _send_job_async():
             try:
-                # Path for ElevatorXEcoSystAssignment object
-                assignment_base_path = f"{self.ECO_TO_PLC_BASE}/{elevator_id_str}/Elevator{station_idx_for_opc_node + 1}EcoSystAssignment"
-                # Path for variables directly under ElevatorX object
-                lift_base_path = f"{self.ECO_TO_PLC_BASE}/{elevator_id_str}"
-
-                # Determine the correct OPC UA name for iCancelAssignment
-                cancel_assignment_opc_name = "iCancelAssignment" # Default correct spelling
-                if lift_id == LIFT1_ID: # LIFT1_ID is 'Lift1' from lift_visualization
-                    cancel_assignment_opc_name = "iCancelAssignment" 
-
-                # Write to ElevatorXEcoSystAssignment
-                success_type = await self.opcua_client.write_value(f"{assignment_base_path}/iTaskType", task_type, ua.VariantType.Int64)
-                success_origin = await self.opcua_client.write_value(f"{assignment_base_path}/iOrigination", origin, ua.VariantType.Int64)
-                success_dest = await self.opcua_client.write_value(f"{assignment_base_path}/iDestination", destination, ua.VariantType.Int64)
-                
-                # Write directly under ElevatorX
-                success_ack = await self.opcua_client.write_value(f"{lift_base_path}/xAcknowledgeMovement", False, ua.VariantType.Boolean)
-                success_cancel = await self.opcua_client.write_value(f"{lift_base_path}/{cancel_assignment_opc_name}", 0, ua.VariantType.Int64) # Changed to Int64
-
-                if success_type and success_origin and success_dest and success_ack and success_cancel:
+                # One Write request: the assignment (ElevatorXEcoSystAssignment) plus the reset flags directly under ElevatorX
+                results = await self._run_io(self.opcua_client.write_values([
+                    (write_paths["iTaskType"], task_type, ua.VariantType.Int64),
+                    (write_paths["iOrigination"], origin, ua.VariantType.Int64),
+                    (write_paths["iDestination"], destination, ua.VariantType.Int64),
+                    (write_paths["xAcknowledgeMovement"], False, ua.VariantType.Boolean),
+                    (write_paths["iCancelAssignment"], 0, ua.VariantType.Int64), # Changed to Int64
+                ]))
+
+                if all(results):
                     logger.info(f"Successfully sent job to {lift_id} ({elevator_id_str}).")
+                    self._request_plc_refresh()
                     # Optionally provide user feedback, though logs are primary for now
                 else:
                     logger.error(f"Failed to send job to {lift_id} ({elevator_id_str}). Check OPC UA server/logs.")
@@ -1027,7 +1495,7 @@ class EcoSystemGUI_DualLift_ST:
 
     def acknowledge_job_step(self, lift_id: str):
         """Acknowledges a job step (movement) for the PLC."""
-        if not self.opcua_client.is_connected:
+        if not self.is_connected:
             messagebox.showwarning("OPC UA", "Not connected to PLC.")
             return
         
@@ -1039,10 +1507,11 @@ class EcoSystemGUI_DualLift_ST:
         logger.info(f"Acknowledge requested by user for {lift_id} ({elevator_id}).")  # Log when user requests ack
         async def async_ack():
             # Corrected path: Directly under the ElevatorX object
-            path = f"{self.ECO_TO_PLC_BASE}/{elevator_id}/xAcknowledgeMovement"
-            success = await self.opcua_client.write_value(path, True, ua.VariantType.Boolean)
+            path = self._lift_write_paths[lift_id]["xAcknowledgeMovement"]
+            success = await self._run_io(self.opcua_client.write_value(path, True, ua.VariantType.Boolean))
             if success:
                 logger.info(f"Acknowledge sent to PLC for {lift_id} ({elevator_id}) at path {path}.")  # Log when ack is sent
+                self._request_plc_refresh()
                 # Optionally, reset the GUI ack button or status here, though monitoring loop should update it
             else:
                 logger.error(f"Failed to send acknowledge for {lift_id} ({elevator_id}).")
@@ -1056,9 +1525,9 @@ class EcoSystemGUI_DualLift_ST:
             return
 
         elevator_id_str = self._get_elevator_identifier(lift_id)
-        station_idx_for_opc_node = self._get_station_index(lift_id)
+        write_paths = self._lift_write_paths.get(lift_id)
 
-        if elevator_id_str is None or station_idx_for_opc_node is None:
+        if elevator_id_str is None or write_paths is None:
             logger.error(f"Cannot determine OPC identifiers for GUI lift ID: {lift_id} in clear_task")
             messagebox.showerror("Internal Error", "Could not determine OPC identifiers for clear_task.")
             return
@@ -1067,28 +1536,17 @@ class EcoSystemGUI_DualLift_ST:
 
         async def _clear_task_async():
             try:
-                # Path for ElevatorXEcoSystAssignment object
-                assignment_base_path = f"{self.ECO_TO_PLC_BASE}/{elevator_id_str}/Elevator{station_idx_for_opc_node + 1}EcoSystAssignment"
-                # Path for variables directly under ElevatorX object
-                lift_base_path = f"{self.ECO_TO_PLC_BASE}/{elevator_id_str}"
-
-                # Determine the correct OPC UA name for iCancelAssignment
-                cancel_assignment_opc_name = "iCancelAssignment" # Default correct spelling
-                if lift_id == LIFT1_ID: # LIFT1_ID is 'Lift1' from lift_visualization
-                    cancel_assignment_opc_name = "iCancelAssignment" # Typo for LIFT1_ID
-
-                # Reset task type in ElevatorXEcoSystAssignment
-                success_task_type = await self.opcua_client.write_value(f"{assignment_base_path}/iTaskType", 0, ua.VariantType.Int64)
-                
-                # Reset cancel assignment directly under ElevatorX
-                success_cancel = await self.opcua_client.write_value(f"{lift_base_path}/{cancel_assignment_opc_name}", 0, ua.VariantType.Int64) # Changed to Int64
-                
-                # Also reset xAcknowledgeMovement if it's part of a "clear" operation's intent
-                success_ack = await self.opcua_client.write_value(f"{lift_base_path}/xAcknowledgeMovement", False, ua.VariantType.Boolean)
-
-
-                if success_task_type and success_cancel and success_ack:
+                # One Write request: task type in ElevatorXEcoSystAssignment, cancel assignment directly under ElevatorX,
+                # and xAcknowledgeMovement since resetting it is part of a "clear" operation's intent
+                results = await self._run_io(self.opcua_client.write_values([
+                    (write_paths["iTaskType"], 0, ua.VariantType.Int64),
+                    (write_paths["iCancelAssignment"], 0, ua.VariantType.Int64), # Changed to Int64
+                    (write_paths["xAcknowledgeMovement"], False, ua.VariantType.Boolean),
+                ]))
+
+                if all(results):
                     logger.info(f"Task cleared successfully for {lift_id} ({elevator_id_str}).")
+                    self._request_plc_refresh()
                 else:
                     logger.error(f"Failed to fully clear task for {lift_id} ({elevator_id_str}). Some OPC UA writes might have failed.")
             except Exception as e:
@@ -1097,28 +1555,70 @@ class EcoSystemGUI_DualLift_ST:
 
         asyncio.create_task(_clear_task_async())
 
-async def run_gui(root):
-    while True:
+def run_gui(root):
+    """Pumps Tk events from asyncio timer callbacks. Polls fast while Tk is busy and backs off while the GUI is idle.
+
+    Returns a future that completes once the Tk root is gone.
+    """
+    loop = asyncio.get_running_loop()
+    gui_closed = loop.create_future()
+
+    def finish(exc=None):
+        if not gui_closed.done():
+            if exc is None:
+                gui_closed.set_result(None)
+            else:
+                gui_closed.set_exception(exc)
+        logger.info("Exited run_gui loop.")
+
+    def pump(poll_interval):
+        if gui_closed.done(): return # Cancelled by main(); stop rescheduling
         try:
-            if not root.winfo_exists(): break 
-            root.update() 
-            await asyncio.sleep(0.01)
+            if not root.winfo_exists():
+                finish()
+                return
+            handled_events = 0
+            while handled_events < GUI_MAX_EVENTS_PER_POLL and root.tk.dooneevent(_tkinter.DONT_WAIT):
+                handled_events += 1
+            if handled_events:
+                poll_interval = GUI_POLL_MIN_INTERVAL_S
+            else:
+                poll_interval = min(poll_interval * 2, GUI_POLL_MAX_INTERVAL_S)
+            loop.call_later(poll_interval, pump, poll_interval)
         except tk.TclError as e:
              if "application has been destroyed" in str(e).lower() or "invalid command name" in str(e).lower():
                  logger.info("GUI main loop: Root window destroyed or invalid command, exiting loop.")
-                 break
+                 finish()
              else:
                  logger.exception("GUI main loop: TclError occurred.")
-                 raise
+                 finish(e)
         except Exception as e:
             logger.exception("GUI main loop: Unexpected error.")
-            break
-    logger.info("Exited run_gui loop.")
+            finish()
+
+    loop.call_soon(pump, GUI_POLL_MIN_INTERVAL_S)
+    return gui_closed
+
+def _destroy_root(root):
+    """Destroys the Tk root window unless it is already gone."""
+    try:
+        if root.winfo_exists():
+            root.destroy()
+    except tk.TclError:
+        pass # Already destroyed (e.g. by on_closing_async)
+
+def _log_asyncio_exception(loop, context):
+    """Loop-wide exception handler so errors in fire-and-forget tasks are logged in one place."""
+    logger.error(f"asyncio: {context.get('message')}", exc_info=context.get('exception'))
 
 async def main():
+    loop = asyncio.get_running_loop()
+    loop.set_exception_handler(_log_asyncio_exception)
     root = tk.Tk()
     gui = EcoSystemGUI_DualLift_ST(root)
     
+    closing = False
+
     async def on_closing_async(): 
         logger.info("Async closing operations started...")
         # if gui.auto_mode_controller and gui.auto_mode_controller.is_running: # REMOVED
@@ -1126,88 +1626,36 @@ async def main():
         #     await gui.auto_mode_controller.stop_auto_mode() # REMOVED
         #     logger.info("Auto mode stopped.") # REMOVED
 
-        if gui.monitoring_task:
-            logger.info("Cancelling PLC monitoring task...")
-            gui.monitoring_task.cancel()
-            gui.monitoring_task = None
-        if gui.opcua_client and gui.opcua_client.is_connected:
-            logger.info("OPC UA client is connected, attempting async disconnect.")
-            await gui.opcua_client.disconnect() 
+        logger.info("Stopping PLC tasks and disconnecting the OPC UA client...")
+        await gui.shutdown_io()
         if root.winfo_exists():
             root.destroy()
         logger.info("Window destroyed after potential disconnect and auto mode stop.")
 
     def on_closing_sync_wrapper(): 
+        nonlocal closing
         logger.info("WM_DELETE_WINDOW triggered.")
-        if asyncio.get_event_loop().is_running():
-            asyncio.create_task(on_closing_async())
-        else:
-            logger.warning("Event loop not running during on_closing. Attempting to stop auto mode and destroy root directly.")
-            # Try to stop auto mode controller if event loop isn't running (best effort)
-            if gui.auto_mode_controller and gui.auto_mode_controller.is_running:
-                # This is tricky without a running loop for the async stop.
-                # For simplicity, we might just log and proceed.
-                # Or, if AutoModeController's stop has a synchronous part:
-                # gui.auto_mode_controller.is_running = False # Force stop flag
-                logger.warning("Cannot guarantee clean async stop of auto_mode_controller without running event loop.")
-
-            if gui.opcua_client and gui.opcua_client.is_connected:
-                 logger.warning("OPC UA client connected, but event loop not running for async disconnect.")
-                 # asyncio.run(gui.opcua_client.disconnect()) # This might cause issues if called from sync context that's part of an outer async context
-            if root.winfo_exists(): root.destroy()
+        if closing:
+            return # Shutdown already in progress (window close clicked twice)
+        closing = True
+        # Tk callbacks are pumped by run_gui from this loop, so it is always the running loop here
+        loop.create_task(on_closing_async())
 
     root.protocol("WM_DELETE_WINDOW", on_closing_sync_wrapper)
     
-    gui_task = asyncio.create_task(run_gui(root))
-    
-    try: 
-        await gui_task
-    except asyncio.CancelledError: 
-        logger.info("GUI task cancelled.")
-    except Exception as e:
-        logger.error(f"Error in GUI task: {e}", exc_info=True)
-    finally:
-        logger.info("Main finally block reached.")
-        # Ensure auto mode is stopped
-        # if gui.auto_mode_controller and gui.auto_mode_controller.is_running:
-        #     logger.info("Main finally: Auto mode is running, ensuring it's stopped.")
-        #     try:
-        #         loop = asyncio.get_event_loop()
-        #         if loop.is_running() and not loop.is_closed():
-        #             stop_auto_task = asyncio.create_task(gui.auto_mode_controller.stop_auto_mode())
-        #             # Give it a moment to complete, but don't block indefinitely
-        #             await asyncio.wait_for(stop_auto_task, timeout=2.0) 
-        #             logger.info("Main finally: Auto mode stop task completed or timed out.")
-        #         else:
-        #             logger.warning("Main finally: Event loop not running or closed, cannot stop auto mode cleanly.")
-        #     except asyncio.TimeoutError:
-        #         logger.warning("Main finally: Timeout waiting for auto mode to stop.")
-        #     except Exception as e_auto_stop:
-        #         logger.error(f"Main finally: Error trying to stop auto mode: {e_auto_stop}")
-        
-        if gui.opcua_client and gui.opcua_client.is_connected:
-            logger.info("Main finally: OPC UA client is connected, ensuring disconnection.")
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running() and not loop.is_closed():
-                    disconnect_task = asyncio.create_task(gui.opcua_client.disconnect())
-                    await asyncio.wait_for(disconnect_task, timeout=2.0) 
-                elif not gui.opcua_client.is_connected: 
-                    pass
-                else:
-                    logger.info("Main finally: Event loop not running, attempting blocking disconnect.")
-                    asyncio.run(gui.opcua_client.disconnect()) 
-            except asyncio.TimeoutError:
-                logger.error("Main finally: Timeout during final disconnect attempt.")
-            except RuntimeError as e_rt:
-                logger.error(f"Main finally: Runtime error during disconnect: {e_rt}. Might be due to event loop state.")
-            except Exception as e_final_disconnect:
-                 logger.error(f"Main finally: Error during final disconnect attempt: {e_final_disconnect}", exc_info=True)
-
-        if root.winfo_exists(): 
-            logger.info("Main finally: Destroying root window if it still exists.")
-            root.destroy()
-        logger.info("Application shutdown sequence complete.")
+    async with contextlib.AsyncExitStack() as stack:
+        # Teardown runs LIFO: stop the OPC UA IO loop (disconnecting the client) first, then destroy the Tk root
+        stack.callback(_destroy_root, root)
+        stack.push_async_callback(gui.shutdown_io)
+
+        gui_closed = run_gui(root)
+        try: 
+            await gui_closed
+        except asyncio.CancelledError: 
+            logger.info("GUI task cancelled.")
+        except Exception as e:
+            logger.error(f"Error in GUI task: {e}", exc_info=True)
+    logger.info("Application shutdown sequence complete.")
 
 if __name__ == "__main__":
     try:
@@ -1221,3 +1669,4 @@ if __name__ == "__main__":
         logger.exception("Unhandled exception in __main__:") # Corrected: removed unterminated string
     finally:
         logger.info("Application exiting __main__.")
+        log_listener.stop() # Flush any queued records before the interpreter exits
@@ -1,5 +1,7 @@
 import asyncio
 import logging
+import logging.handlers
+import queue
 from asyncua import Server, ua
 import random
 import time
@@ -23,14 +25,20 @@ if (os.path.exists(log_filename)):
         print(f"Warning: Could not clear log file {log_filename}: {e}")
 
 log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+_log_file_handler = logging.FileHandler(log_filename, mode='a')
+_log_console_handler = logging.StreamHandler()
+for _handler in (_log_file_handler, _log_console_handler):
+    _handler.setFormatter(logging.Formatter(log_format))
+
+# The simulation loop only enqueues records; a listener thread does the actual file/console I/O
+log_queue = queue.SimpleQueue()
 logging.basicConfig(
     level=logging.INFO, # Changed to INFO for more details dev
-    format=log_format,
-    handlers=[
-        logging.FileHandler(log_filename, mode='a'),
-        logging.StreamHandler()
-    ]
+    format='%(message)s', # The listener's handlers add the prefix; QueueHandler only merges args into the message
+    handlers=[logging.handlers.QueueHandler(log_queue)]
 )
+log_listener = logging.handlers.QueueListener(log_queue, _log_file_handler, _log_console_handler)
+log_listener.start()
 logger = logging.getLogger("PLCSim_DualLift")
 
 logging.getLogger("asyncua").setLevel(logging.ERROR)
@@ -98,6 +106,7 @@ class PLCSimulator_DualLift:
         self.endpoint = endpoint
         self.namespace_idx = None
         self.opc_node_map = {}
+        self._input_var_flags = {} # node_key -> whether the EcoSystem writes it, classified once per variable
         self.running = False
         self._task_duration = 2.0 # General simulation duration for some actions
         self._pickup_offset = 2
@@ -300,11 +309,11 @@ class PLCSimulator_DualLift:
             # Internal state should only be updated when physical movement is complete
             if state_var_name == "iElevatorRowLocation":
                 # Only update OPC value, not internal state - physical position managed separately
-                logger.debug(f"[{lift_id_or_system_key}] Skipping automatic update of internal iElevatorRowLocation, updated only OPC to {value}")
+                logger.debug("[%s] Skipping automatic update of internal iElevatorRowLocation, updated only OPC to %s", lift_id_or_system_key, value)
                 pass
             # Special handling for xTrayInElevator when picking up a tray (True)
             elif state_var_name == "xTrayInElevator" and value is True:
-                logger.debug(f"[{lift_id_or_system_key}] Tray pickup requested but will be delayed for visualization")
+                logger.debug("[%s] Tray pickup requested but will be delayed for visualization", lift_id_or_system_key)
                 # Start the tray pickup process instead of immediate update
                 await self._start_tray_pickup(lift_id_or_system_key)
                 # Don't update internal state - will be done when pickup is complete
@@ -320,9 +329,12 @@ class PLCSimulator_DualLift:
         if node:
             try:
                 value = await node.read_value()
-                is_input_var = state_var_name.startswith("Eco_") or \
-                               (lift_id_or_system_key == "System" and state_var_name == "xWatchDog") or \
-                               (state_var_name == "xClearError") 
+                is_input_var = self._input_var_flags.get(node_key)
+                if is_input_var is None:
+                    is_input_var = self._input_var_flags[node_key] = (
+                        state_var_name.startswith("Eco_") or
+                        (lift_id_or_system_key == "System" and state_var_name == "xWatchDog") or
+                        (state_var_name == "xClearError"))
                 if is_input_var:
                     if lift_id_or_system_key == "System":
                         if state_var_name in self.system_state: self.system_state[state_var_name] = value
@@ -427,7 +439,7 @@ class PLCSimulator_DualLift:
         if node:
             try:
                 await node.write_value(new_position)
-                logger.debug(f"[{lift_id}] Updated OPC elevator position to {new_position}")
+                logger.debug("[%s] Updated OPC elevator position to %s", lift_id, new_position)
             except Exception as e:
                 logger.error(f"Failed to write OPC value for elevator position: {e}")
                 
@@ -448,7 +460,7 @@ class PLCSimulator_DualLift:
         if node:
             try:
                 await node.write_value(has_tray)
-                logger.debug(f"[{lift_id}] Updated OPC tray status to {has_tray}")
+                logger.debug("[%s] Updated OPC tray status to %s", lift_id, has_tray)
             except Exception as e:                logger.error(f"Failed to write OPC value for tray status: {e}")
     
     async def _start_tray_pickup(self, lift_id):
@@ -618,7 +630,8 @@ class PLCSimulator_DualLift:
             logger.info(f"[{lift_id}] Error cleared. Current cycle {current_cycle}, next cycle will be {next_cycle}")
 
 
-        logger.debug(f"[{lift_id}] Cycle={current_cycle}, Job: Type={task_type_from_eco}, Origin={origination_from_eco}, Dest={destination_from_eco}, Ack={acknowledge_movement}, ErrorCode={state['iErrorCode']}")
+        logger.debug("[%s] Cycle=%s, Job: Type=%s, Origin=%s, Dest=%s, Ack=%s, ErrorCode=%s", lift_id, current_cycle, task_type_from_eco,
+                     origination_from_eco, destination_from_eco, acknowledge_movement, state['iErrorCode'])
         
         # --- Main State Machine Logic ---
         if current_cycle == -10: # Software Init
@@ -856,7 +869,8 @@ class PLCSimulator_DualLift:
             step_comment = f"FullAss: Moving to Origin {target_loc}"
             
             location_matches_target = state["iElevatorRowLocation"] == target_loc
-            logger.debug(f"[{lift_id}] Cycle 102: Location: {state['iElevatorRowLocation']}, Target: {target_loc}, Match: {location_matches_target}, SubEngineMoving: {state['_sub_engine_moving']}")
+            logger.debug("[%s] Cycle 102: Location: %s, Target: %s, Match: %s, SubEngineMoving: %s", lift_id, state['iElevatorRowLocation'],
+                             target_loc, location_matches_target, state['_sub_engine_moving'])
 
             if location_matches_target: 
                 next_cycle = 150
@@ -900,7 +914,8 @@ class PLCSimulator_DualLift:
                     state["_sub_engine_moving"] = True
                 
                 step_comment = f"FullAss: Waiting for pickup conditions at {origin}"
-                logger.debug(f"[{lift_id}] Cycle 155: Waiting for pickup conditions. Position correct: {position_correct}, Not moving: {not_moving}, Forks positioned: {forks_positioned}")
+                logger.debug("[%s] Cycle 155: Waiting for pickup conditions. Position correct: %s, Not moving: %s, Forks positioned: %s",
+                             lift_id, position_correct, not_moving, forks_positioned)
                 # Stay in cycle 155 until all conditions are met
                 next_cycle = 155
         elif current_cycle == 160: # Move Forks to Middle
@@ -1148,3 +1163,4 @@ if __name__ == "__main__":
         logger.exception(f"Unhandled exception in __main__: {e}")
     finally:
         logger.info("Exiting application.")
+        log_listener.stop() # Flush any queued records before the interpreter exits
@@ -1,5 +1,7 @@
 import asyncio
 import logging
+import logging.handlers
+import queue
 from asyncua import Server, ua
 import random
 import time
@@ -34,14 +36,21 @@ if (os.path.exists(log_filename)):
         print(f"Warning: Could not clear log file {log_filename}: {e}")
 
 log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+_log_file_handler = logging.FileHandler(log_filename, mode='a')
+_log_console_handler = logging.StreamHandler()
+for _handler in (_log_file_handler, _log_console_handler):
+    _handler.setFormatter(logging.Formatter(log_format))
+
+# The simulation loop only enqueues records; a listener thread does the actual file/console I/O
+log_queue = queue.SimpleQueue()
 logging.basicConfig(
     level=logging.INFO, # Changed to INFO for more details dev
-    format=log_format,
-    handlers=[
-        logging.FileHandler(log_filename, mode='a'),
-        logging.StreamHandler()
-    ]
+    format='%(message)s', # The listener's handlers add the prefix; QueueHandler only merges args into the message
+    handlers=[logging.handlers.QueueHandler(log_queue)],
+    force=True # The RPi.GPIO import warning above may already have configured the root logger
 )
+log_listener = logging.handlers.QueueListener(log_queue, _log_file_handler, _log_console_handler)
+log_listener.start()
 logger = logging.getLogger("PLCSim_DualLift")
 
 logging.getLogger("asyncua").setLevel(logging.ERROR)
@@ -320,7 +329,7 @@ class PLCSimulator_DualLift:
             if state_var_name in self.system_state: self.system_state[state_var_name] = value
         elif lift_id_or_system_key in self.lift_state:
             if state_var_name == "iElevatorRowLocation":
-                logger.debug(f"[{lift_id_or_system_key}] Skipping automatic update of internal iElevatorRowLocation, updated only OPC to {value}")
+                logger.debug("[%s] Skipping automatic update of internal iElevatorRowLocation, updated only OPC to %s", lift_id_or_system_key, value)
                 pass
             elif state_var_name in self.lift_state[lift_id_or_system_key]:
                 self.lift_state[lift_id_or_system_key][state_var_name] = value
@@ -565,7 +574,8 @@ class PLCSimulator_DualLift:
             await self._update_opc_value(lift_id, "iStationStatus", STATUS_OK)
             logger.info(f"[{lift_id}] Error cleared. Current cycle {current_cycle}, next cycle will be {next_cycle}")
 
-        logger.debug(f"[{lift_id}] Cycle={current_cycle}, Job: Type={task_type_from_eco}, Origin={origination_from_eco}, Dest={destination_from_eco}, Ack={acknowledge_movement}, ErrorCode={state['iErrorCode']}")
+        logger.debug("[%s] Cycle=%s, Job: Type=%s, Origin=%s, Dest=%s, Ack=%s, ErrorCode=%s", lift_id, current_cycle, task_type_from_eco,
+                     origination_from_eco, destination_from_eco, acknowledge_movement, state['iErrorCode'])
 
         # --- RESETLOGICA: FORCEER TERUG NAAR 10 NA FOUTRESET ---
         if state["iErrorCode"] == 0 and not self.emg_stop_active and (
@@ -783,7 +793,7 @@ class PLCSimulator_DualLift:
                     logger.warning(f"[{lift_id}] Elevator not at pickup position for cycle 155. Current: {state['iElevatorRowLocation']}, Target: {origin}. Starting movement.")
                     state["_move_target_pos"] = origin; state["_move_start_time"] = time.time(); state["_sub_engine_moving"] = True
                 step_comment = f"FullAss: Waiting for pickup conditions at {origin}. PosOK:{position_correct}, NotMoving:{not_moving}, ForkOK:{forks_positioned}"
-                logger.debug(f"[{lift_id}] Cycle 155: Waiting. PosOK:{position_correct}, NotMoving:{not_moving}, ForkOK:{forks_positioned}")
+                logger.debug("[%s] Cycle 155: Waiting. PosOK:%s, NotMoving:%s, ForkOK:%s", lift_id, position_correct, not_moving, forks_positioned)
                 next_cycle = 155
         elif current_cycle == 160:
             step_comment = "FullAss: Forks to middle after pickup"
@@ -1222,7 +1232,7 @@ async def main():
                 for task in tasks:
                     task.cancel()
                 await asyncio.gather(*tasks, return_exceptions=True)
-                asyncio.get_event_loop().stop()
+                asyncio.get_running_loop().stop()
 
             import signal
             signal.signal(signal.SIGINT, lambda sig, frame: asyncio.create_task(shutdown_wrapper(sig)))
@@ -1256,8 +1266,8 @@ async def main():
         if plc_sim.running: # If stop wasn't called by a signal
             await plc_sim.stop()
         # Ensure the loop stops if it hasn't already
-        if sys.platform == 'win32' and asyncio.get_event_loop().is_running():
-             asyncio.get_event_loop().stop() # Necessary for Windows signal handling to exit cleanly
+        if sys.platform == 'win32':
+             asyncio.get_running_loop().stop() # Necessary for Windows signal handling to exit cleanly
 
         logger.info("PLC Simulator shutdown complete.")
         
@@ -1278,4 +1288,5 @@ if __name__ == "__main__":
                 logger.info("Final GPIO cleanup in __main__.")
             except Exception as e:
                 logger.error(f"Error during final GPIO cleanup in __main__: {e}")
-        logger.info("Exiting application from __main__.")
\ No newline at end of file
+        logger.info("Exiting application from __main__.")
+        log_listener.stop() # Flush any queued records before the interpreter exits
\ No newline at end of file
@@ -226,7 +226,7 @@ class LiftVisualizationManager:
             self.root.after_cancel(self.current_animation_tasks[lift_id])
             self.current_animation_tasks[lift_id] = None
             self.animation_running[lift_id] = False
-            logger.debug(f"Cancelled existing animation for lift {lift_id}")
+            logger.debug("Cancelled existing animation for lift %s", lift_id)
 
         vis_data = self.lift_visuals[lift_id]
         current_logical_row = self.last_position.get(lift_id, 1)
@@ -345,7 +345,7 @@ class LiftVisualizationManager:
         
         tray_visible = action_type == 'pickup'
         self.canvas.itemconfig(tray_rect, state=tk.NORMAL if tray_visible else tk.HIDDEN)
-        logger.debug(f"Lift {lift_id} tray action: {action_type} at row {row}. Tray visible: {tray_visible}")
+        logger.debug("Lift %s tray action: %s at row %s. Tray visible: %s", lift_id, action_type, row, tray_visible)
         
         # Update visual state to show the correct fork position and tray visibility
         self.update_lift_visual_state(lift_id, self.last_position[lift_id], tray_visible, fork_side_val, False)
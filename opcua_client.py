@@ -1,28 +1,89 @@
 \
 import asyncio
 import logging
+import time
 from asyncua import Client, ua
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Whitespace plus the NUL padding of fixed-length PLC strings
+_PLC_STRING_PADDING = b" \t\r\n\x0b\x0c\x00"
+# A failing read is retried on every poll; repeats of its warning are dropped for this long
+READ_WARNING_INTERVAL_S = 30.0
+
+def decode_plc_value(value: Any) -> Any:
+    """Normalizes PLC byte strings to str so callers never have to handle bytes."""
+    if isinstance(value, bytes):
+        # Strip on the bytes, so only the text itself goes through the decoder
+        return value.strip(_PLC_STRING_PADDING).decode('utf-8', 'ignore')
+    return value
+
+def warn_throttled(log: logging.Logger, last_warning_at: Dict[str, float], key: str, msg: str, *args):
+    """Logs a warning on log at most once per READ_WARNING_INTERVAL_S for key; last_warning_at holds the last times per key."""
+    now = time.monotonic()
+    if now - last_warning_at.get(key, float('-inf')) < READ_WARNING_INTERVAL_S:
+        return
+    last_warning_at[key] = now
+    log.warning(msg, *args)
+
+def _is_quiet_write(node_identifier: str) -> bool:
+    """Watchdog writes happen every cycle, so they are written without info logging."""
+    return "WatchDog" in node_identifier # Also matches xWatchDog
+
+class _DataChangeForwarder:
+    """asyncua subscription handler that forwards (node_identifier, decoded value) to a callback
+    and the subscription's status changes (e.g. a lost connection) to status_callback(status_code)."""
+    def __init__(self, identifiers_by_node, callback, status_callback):
+        self._identifiers_by_node = identifiers_by_node
+        self._callback = callback
+        self._status_callback = status_callback
+
+    def datachange_notification(self, node, val, data):
+        node_identifier = self._identifiers_by_node.get(node)
+        if node_identifier is not None:
+            self._callback(node_identifier, decode_plc_value(val))
+
+    def status_change_notification(self, status):
+        self._status_callback(status.Status)
+
 class OPCUAClient:
     def __init__(self, endpoint_url, ns_uri):
         self.endpoint_url = endpoint_url
         self.ns_uri = ns_uri
         self.client = Client(url=self.endpoint_url)
+        self._client_url = self.endpoint_url # Endpoint self.client was created for
         self.plc_ns_idx = None
         self.is_connected = False
+        self._node_cache: Dict[str, Any] = {} # node_identifier -> resolved asyncua Node (pre-resolved or browsed once)
+        self._write_type_cache: Dict[str, ua.VariantType] = {} # node_identifier -> integer type the server accepted after a BadTypeMismatch
+        self._read_cache: Dict[str, Tuple[float, Any]] = {} # node_identifier -> (monotonic read time, value)
+        self._cache_ttl_s: Dict[str, float] = {} # node_identifier -> TTL in seconds; absent means always read
+        self._last_warning_at: Dict[str, float] = {} # throttle key -> monotonic time its warning was last logged
+        self._unresolvable: set = set() # node_identifiers the server could not resolve; not retried until reconnect
+        self._session_close_task: Optional[asyncio.Task] = None # Closes a session the server dropped (see _on_session_lost)
 
     async def connect(self):
+        if self._session_close_task is not None:
+            await self._session_close_task # The client object is reused, so the lost session must be closed first
         if self.is_connected:
-            logger.info("OPCUAClient: Already connected.")
-            return True
+            # Reuse the open session (no new SecureChannel/CreateSession) if it is still for this endpoint and alive
+            if self._client_url == self.endpoint_url and await self._session_alive():
+                logger.info("OPCUAClient: Already connected, reusing the existing session.")
+                # NodeIds stay valid within the session, but the PLC program may have changed while the GUI was disconnected
+                self._unresolvable.clear()
+                self._read_cache.clear()
+                return True
+            await self.disconnect()
+        if self._client_url != self.endpoint_url:
+            self.client = Client(url=self.endpoint_url) # The endpoint was changed since the client was created
+            self._client_url = self.endpoint_url
         try:
             logger.info(f"OPCUAClient: Attempting to connect to {self.endpoint_url}")
             await self.client.connect()
             self.plc_ns_idx = await self.client.get_namespace_index(self.ns_uri)
             self.is_connected = True
+            self._unresolvable.clear() # The server may expose different nodes now
             logger.info(f"OPCUAClient: Connected to {self.endpoint_url}. Namespace Index: {self.plc_ns_idx}")
             return True
         except Exception as e:
@@ -30,6 +91,26 @@ class OPCUAClient:
             self.is_connected = False
             return False
 
+    def _warn_throttled(self, key: str, msg: str, *args):
+        """Logs a warning at most once per READ_WARNING_INTERVAL_S for key, so a broken node does not flood the log every poll."""
+        warn_throttled(logger, self._last_warning_at, key, msg, *args)
+
+    def _forget_node(self, node_identifier: str):
+        """Drops what was learned about a node after the server reported its NodeId unknown, so it is resolved again."""
+        logger.warning(f"OPCUAClient: Server no longer knows the node for {node_identifier}; it will be resolved again.")
+        self._node_cache.pop(node_identifier, None)
+        self._write_type_cache.pop(node_identifier, None)
+        self._read_cache.pop(node_identifier, None)
+
+    async def _session_alive(self) -> bool:
+        """Checks an open session with one cheap read (the namespace array)."""
+        try:
+            self.plc_ns_idx = await self.client.get_namespace_index(self.ns_uri)
+            return True
+        except Exception as e:
+            logger.warning(f"OPCUAClient: Existing session is no longer usable: {e}")
+            return False
+
     async def disconnect(self):
         if self.client and self.is_connected:
             try:
@@ -40,9 +121,92 @@ class OPCUAClient:
             finally:
                 self.is_connected = False
                 logger.info("OPCUAClient: Disconnected.")
+        elif self._session_close_task is not None:
+            await self._session_close_task # A lost session is still being closed
         else:
             logger.info("OPCUAClient: Client not connected or already disconnected.")
         self.is_connected = False # Ensure state is updated
+        self._clear_session_caches()
+
+    def _clear_session_caches(self):
+        """Forgets everything learned from the current session; NodeIds are only valid for the server we were connected to."""
+        self._read_cache.clear()
+        self._node_cache.clear()
+        self._unresolvable.clear()
+        self._write_type_cache.clear()
+
+    def _on_session_lost(self):
+        """Called on the client's loop when the server stopped serving the session: marks the client disconnected
+        and closes the dead session in the background, so asyncua stops retrying its publish loop."""
+        self.is_connected = False
+        self._clear_session_caches()
+        if self._session_close_task is None:
+            self._session_close_task = asyncio.get_running_loop().create_task(self._close_lost_session())
+
+    async def _close_lost_session(self):
+        try:
+            await self.client.disconnect()
+        except Exception as e:
+            logger.warning(f"OPCUAClient: Error closing the lost session: {e}")
+        finally:
+            self._session_close_task = None
+            logger.info("OPCUAClient: Lost session closed.")
+
+    async def resolve_nodes(self, node_identifiers) -> int:
+        """Resolves node paths with a single TranslateBrowsePathsToNodeIds request and caches the nodes.
+
+        get_node() then returns cached nodes without browsing the address space. Returns the number of nodes resolved.
+        """
+        if not self.is_connected or self.plc_ns_idx is None:
+            logger.warning("OPCUAClient: resolve_nodes called without client connection.")
+            return 0
+        pending = [node_identifier for node_identifier in node_identifiers
+                   if node_identifier not in self._node_cache and node_identifier not in self._unresolvable]
+        if not pending:
+            return 0
+
+        relative_paths = ["/" + "/".join(f"{self.plc_ns_idx}:{part_name}" for part_name in node_identifier.split('/'))
+                          for node_identifier in pending]
+        try:
+            results = await self.client.translate_browsepaths(self.client.nodes.objects.nodeid, relative_paths)
+        except Exception as e:
+            self._warn_throttled("resolve", "OPCUAClient: Error resolving %d node paths: %s", len(pending), e)
+            return 0
+
+        resolved = 0
+        for node_identifier, result in zip(pending, results):
+            if result.StatusCode.is_good() and result.Targets:
+                target = result.Targets[0].TargetId
+                self._node_cache[node_identifier] = self.client.get_node(ua.NodeId(target.Identifier, target.NamespaceIndex))
+                resolved += 1
+            else:
+                self._unresolvable.add(node_identifier) # Polls skip it instead of translating and browsing it again
+                self._warn_throttled(f"resolve:{node_identifier}", "OPCUAClient: Could not resolve node path '%s': %s",
+                                     node_identifier, result.StatusCode)
+        logger.info(f"OPCUAClient: Resolved {resolved}/{len(pending)} node paths.")
+        return resolved
+
+    def set_cache_ttl(self, node_identifier: str, ttl_ms: float):
+        """Lets reads of node_identifier be served from cache for ttl_ms after the last real read (0 disables)."""
+        if ttl_ms > 0:
+            self._cache_ttl_s[node_identifier] = ttl_ms / 1000.0
+        else:
+            self._cache_ttl_s.pop(node_identifier, None)
+            self._read_cache.pop(node_identifier, None)
+
+    def _get_cached_value(self, node_identifier: str) -> Tuple[bool, Any]:
+        """Returns (True, value) if a fresh cached value exists for node_identifier, else (False, None)."""
+        ttl = self._cache_ttl_s.get(node_identifier)
+        if ttl is None:
+            return False, None
+        cached = self._read_cache.get(node_identifier)
+        if cached is None or time.monotonic() - cached[0] >= ttl:
+            return False, None
+        return True, cached[1]
+
+    def _store_cached_value(self, node_identifier: str, value: Any):
+        if node_identifier in self._cache_ttl_s:
+            self._read_cache[node_identifier] = (time.monotonic(), value)
 
     async def get_node(self, node_path_str: str): # node_path_str e.g., "GVL_OPC/PlcToEco/Elevator1/iCycle"
         if not self.is_connected or not self.client:
@@ -51,6 +215,11 @@ class OPCUAClient:
         if self.plc_ns_idx is None:
             logger.warning("OPCUAClient: get_node called before PLC namespace index is known.")
             return None
+        cached_node = self._node_cache.get(node_path_str)
+        if cached_node is not None:
+            return cached_node
+        if node_path_str in self._unresolvable:
+            return None # resolve_nodes already reported it; browsing would fail the same way
 
         try:
             parts = node_path_str.split('/')
@@ -59,7 +228,7 @@ class OPCUAClient:
                 return None
 
             current_node = self.client.get_objects_node()
-            logger.debug(f"OPCUAClient: Starting browse for '{node_path_str}' from Objects node: {current_node}")
+            logger.debug("OPCUAClient: Starting browse for '%s' from Objects node: %s", node_path_str, current_node)
 
             for part_name in parts:
                 qualified_part_name = f"{self.plc_ns_idx}:{part_name}"
@@ -70,37 +239,107 @@ class OPCUAClient:
                         current_node = next_node
                         # logger.debug(f"OPCUAClient: Found part '{part_name}', current node: {current_node.nodeid}")
                     else:
-                        logger.error(f"OPCUAClient: Part '{part_name}' not found under '{current_node.nodeid}' for path '{node_path_str}'")
+                        self._warn_throttled(f"browse:{node_path_str}", "OPCUAClient: Part '%s' not found under '%s' for path '%s'",
+                                             part_name, current_node.nodeid, node_path_str)
                         return None
                 except ua.UaStatusCodeError as e:
-                    logger.error(f"OPCUAClient: OPC UA Error getting child '{part_name}' for path '{node_path_str}': {e} (Code: {e.code})")
+                    self._warn_throttled(f"browse:{node_path_str}", "OPCUAClient: OPC UA Error getting child '%s' for path '%s': %s (Code: %s)",
+                                         part_name, node_path_str, e, e.code)
                     return None
                 except Exception as e_inner:
-                    logger.error(f"OPCUAClient: Unexpected error getting child '{part_name}' for path '{node_path_str}': {e_inner}")
+                    self._warn_throttled(f"browse:{node_path_str}", "OPCUAClient: Unexpected error getting child '%s' for path '%s': %s",
+                                         part_name, node_path_str, e_inner)
                     return None
             
-            logger.debug(f"OPCUAClient: Successfully found node for path '{node_path_str}': {current_node.nodeid}")
+            logger.debug("OPCUAClient: Successfully found node for path '%s': %s", node_path_str, current_node.nodeid)
+            self._node_cache[node_path_str] = current_node # Later reads/writes of this path skip the browse
             return current_node
 
         except ua.UaStatusCodeError as e:
-            logger.error(f"OPCUAClient: OPC UA Error finding node for path '{node_path_str}': {e} (Code: {e.code})")
+            self._warn_throttled(f"browse:{node_path_str}", "OPCUAClient: OPC UA Error finding node for path '%s': %s (Code: %s)",
+                                 node_path_str, e, e.code)
             return None
         except Exception as e:
             logger.exception(f"OPCUAClient: Unexpected Error in get_node for path '{node_path_str}': {e}")
             return None
 
+    async def subscribe_data_change(self, node_identifiers, callback, period_ms: int = 200,
+                                    sampling_intervals_ms: Optional[Dict[str, float]] = None,
+                                    default_sampling_interval_ms: float = 50.0, queue_size: int = 10,
+                                    status_callback=None):
+        """Creates a subscription that calls callback(node_identifier, value) whenever one of the nodes changes.
+
+        sampling_intervals_ms overrides the server-side sampling interval per identifier; nodes are monitored
+        in one group per interval. status_callback(status_code) is told about status changes of the subscription;
+        a bad status (the server stopped publishing, e.g. after a lost connection) also marks the client disconnected.
+        Returns the subscription, or None if no subscription could be set up.
+        """
+        if not self.is_connected:
+            logger.warning("OPCUAClient: subscribe_data_change called while not connected.")
+            return None
+
+        identifiers_by_node = {}
+        for node_identifier in node_identifiers:
+            node = await self.get_node(node_identifier)
+            if node:
+                identifiers_by_node[node] = node_identifier
+            else:
+                logger.warning(f"OPCUAClient: Cannot subscribe, node not found for identifier: {node_identifier}")
+        if not identifiers_by_node:
+            return None
+
+        def on_status_change(status_code):
+            if not status_code.is_good():
+                logger.error(f"OPCUAClient: Subscription reported {status_code}; the server connection is lost.")
+                self._on_session_lost()
+            if status_callback is not None:
+                status_callback(status_code)
+
+        subscription = None
+        try:
+            nodes_by_interval: Dict[float, List[Any]] = {}
+            for node, node_identifier in identifiers_by_node.items():
+                interval = (sampling_intervals_ms or {}).get(node_identifier, default_sampling_interval_ms)
+                nodes_by_interval.setdefault(interval, []).append(node)
+
+            subscription = await self.client.create_subscription(period_ms, _DataChangeForwarder(identifiers_by_node, callback, on_status_change))
+            # One CreateMonitoredItems request per sampling group, sent concurrently.
+            # queue_size > 1 keeps short bursts of changes between publishes (oldest discarded on overflow)
+            await asyncio.gather(*(subscription.subscribe_data_change(nodes, queuesize=queue_size, sampling_interval=interval)
+                                   for interval, nodes in nodes_by_interval.items()))
+            logger.info(f"OPCUAClient: Subscribed to {len(identifiers_by_node)} nodes (publishing interval {period_ms} ms, "
+                        f"sampling intervals {sorted(nodes_by_interval)} ms).")
+            return subscription
+        except Exception as e:
+            logger.error(f"OPCUAClient: Could not create subscription: {e}")
+            if subscription is not None:
+                await self.delete_subscription(subscription)
+            return None
+
+    async def delete_subscription(self, subscription):
+        if not self.is_connected:
+            return
+        try:
+            await subscription.delete()
+        except Exception as e:
+            logger.warning(f"OPCUAClient: Error deleting subscription: {e}")
+
     async def read_variable(self, node_identifier: str) -> Optional[Any]: # Renamed from read_value to match EcoSystemSim
         if not self.is_connected:
             logger.warning("OPCUAClient: Read value called while not connected.")
             return None
+        is_cached, value = self._get_cached_value(node_identifier)
+        if is_cached:
+            return value
         try:
             node = await self.get_node(node_identifier)
             if not node:
                 # get_node already logs the error if it fails to find the node
                 logger.warning(f"OPCUAClient: Cannot read variable, node not found for identifier: {node_identifier}")
                 return None
-            value = await node.read_value()
-            logger.debug(f"OPCUAClient: Read value for {node_identifier}: {value}")
+            value = decode_plc_value(await node.read_value())
+            logger.debug("OPCUAClient: Read value for %s: %s", node_identifier, value)
+            self._store_cached_value(node_identifier, value)
             return value
         except ua.UaStatusCodeError as e:
             logger.error(f"OPCUAClient: OPC UA Error reading value for {node_identifier}: {e} (Code: {e.code})")
@@ -109,38 +348,144 @@ class OPCUAClient:
             logger.exception(f"OPCUAClient: Unexpected Error reading value for {node_identifier}: {e}")
             return None
 
+    async def read_variables(self, node_identifiers) -> List[Optional[Any]]:
+        """Reads several variables with a single OPC UA Read request.
+
+        Returns the values in the order of node_identifiers; None for nodes that could not be found or read.
+        """
+        node_identifiers = list(node_identifiers)
+        values = [None] * len(node_identifiers)
+        if not self.is_connected:
+            logger.warning("OPCUAClient: Read variables called while not connected.")
+            return values
+
+        # Nodes not resolved yet are translated in one request instead of being browsed one by one below
+        await self.resolve_nodes(node_identifiers)
+
+        nodes, indices = [], []
+        for idx, node_identifier in enumerate(node_identifiers):
+            is_cached, values[idx] = self._get_cached_value(node_identifier)
+            if is_cached:
+                continue
+            # Resolved nodes come straight from the cache; only misses go through the (browsing) get_node
+            node = self._node_cache.get(node_identifier) or await self.get_node(node_identifier)
+            if node:
+                nodes.append(node)
+                indices.append(idx)
+            else:
+                self._warn_throttled(f"read:{node_identifier}", "OPCUAClient: Cannot read variable, node not found for identifier: %s",
+                                     node_identifier)
+        if not nodes:
+            return values
+
+        try:
+            data_values = await self.client.read_attributes(nodes)
+        except ua.UaStatusCodeError as e:
+            logger.error(f"OPCUAClient: OPC UA Error reading {len(nodes)} variables: {e} (Code: {e.code})")
+            return values
+        except Exception as e:
+            logger.exception(f"OPCUAClient: Unexpected Error reading {len(nodes)} variables: {e}")
+            return values
+
+        for idx, data_value in zip(indices, data_values):
+            if data_value.StatusCode.is_good() and data_value.Value is not None:
+                values[idx] = decode_plc_value(data_value.Value.Value)
+                self._store_cached_value(node_identifiers[idx], values[idx])
+            elif data_value.StatusCode.value == ua.StatusCodes.BadNodeIdUnknown:
+                self._forget_node(node_identifiers[idx])
+            else:
+                self._warn_throttled(f"read:{node_identifiers[idx]}", "OPCUAClient: Bad status reading %s: %s",
+                                     node_identifiers[idx], data_value.StatusCode)
+        return values
+
+    def _build_write_variant(self, node_identifier: str, value: Any, datatype: Optional[ua.VariantType]) -> ua.Variant:
+        """Builds the Variant to write: a learned integer type first, then the given datatype, else inferred from value."""
+        learned_type = self._write_type_cache.get(node_identifier)
+        quiet = _is_quiet_write(node_identifier)
+
+        if learned_type is not None and isinstance(value, int) and not isinstance(value, bool):
+            # An earlier write found the type the server wants; don't fail on the mismatching type again
+            return ua.Variant(value, learned_type)
+        if datatype: 
+            # Minimal logging for watchdog
+            if not quiet:
+                logger.info(f"OPCUAClient: Using provided datatype {datatype.name} for {node_identifier} (value: {value}).")
+            return ua.Variant(value, datatype)
+
+        if isinstance(value, bool):
+            ua_variant_to_write = ua.Variant(value, ua.VariantType.Boolean)
+        elif isinstance(value, int): 
+            ua_variant_to_write = ua.Variant(value, ua.VariantType.Int64) # Default to Int64 for platform consistency
+        elif isinstance(value, float):
+            ua_variant_to_write = ua.Variant(value, ua.VariantType.Double) # Default to Double
+        elif isinstance(value, str):
+            ua_variant_to_write = ua.Variant(value, ua.VariantType.String)
+        else:
+            ua_variant_to_write = ua.Variant(value) 
+        if not quiet:
+            logger.info(f"OPCUAClient: Inferred datatype {ua_variant_to_write.VariantType.name} for {node_identifier} (value: {value}).")
+        return ua_variant_to_write
+
+    async def write_values(self, writes) -> List[bool]:
+        """Writes several (node_identifier, value, datatype) items with a single OPC UA Write request.
+
+        Items rejected with BadTypeMismatch are retried one by one through write_value. Returns per-item success.
+        """
+        writes = list(writes)
+        results = [False] * len(writes)
+        if not self.is_connected:
+            logger.warning("OPCUAClient: Write values called while not connected.")
+            return results
+
+        await self.resolve_nodes([node_identifier for node_identifier, _, _ in writes])
+        nodes, variants, indices = [], [], []
+        for idx, (node_identifier, value, datatype) in enumerate(writes):
+            self._read_cache.pop(node_identifier, None) # Never serve a pre-write value from cache
+            node = self._node_cache.get(node_identifier) or await self.get_node(node_identifier)
+            if node:
+                nodes.append(node)
+                variants.append(self._build_write_variant(node_identifier, value, datatype))
+                indices.append(idx)
+            else:
+                logger.warning(f"OPCUAClient: Cannot write value, node not found for identifier: {node_identifier}")
+        if not nodes:
+            return results
+
+        try:
+            status_codes = await self.client.write_values(nodes, variants, raise_on_partial_error=False)
+        except Exception as e:
+            logger.error(f"OPCUAClient: Error writing {len(nodes)} values: {e}")
+            return results
+
+        for idx, status_code in zip(indices, status_codes):
+            node_identifier, value, datatype = writes[idx]
+            if status_code.is_good():
+                results[idx] = True
+            elif status_code.value == ua.StatusCodes.BadTypeMismatch:
+                results[idx] = await self.write_value(node_identifier, value, datatype) # Finds (and remembers) a working type
+            elif status_code.value == ua.StatusCodes.BadNodeIdUnknown:
+                self._forget_node(node_identifier)
+                results[idx] = await self.write_value(node_identifier, value, datatype) # Resolves the node again
+            else:
+                logger.error(f"OPCUAClient: Bad status writing {value} to {node_identifier}: {status_code}")
+        logger.info(f"OPCUAClient: Wrote {sum(results)}/{len(writes)} values in one request.")
+        return results
+
     async def write_value(self, node_identifier: str, value: Any, datatype: Optional[ua.VariantType] = None) -> bool:
         if not self.is_connected:
             logger.warning("OPCUAClient: Write value called while not connected.")
             return False
+        self._read_cache.pop(node_identifier, None) # Never serve a pre-write value from cache
         try:
-            node = await self.get_node(node_identifier)
+            node = self._node_cache.get(node_identifier) or await self.get_node(node_identifier)
             if not node:
                 logger.warning(f"OPCUAClient: Cannot write value, node not found for identifier: {node_identifier}")
                 return False
 
-            ua_variant_to_write = None
-
-            if datatype: 
-                ua_variant_to_write = ua.Variant(value, datatype)
-                # Minimal logging for watchdog
-                if "xWatchDog" not in node_identifier and "WatchDog" not in node_identifier : 
-                    logger.info(f"OPCUAClient: Using provided datatype {datatype.name} for {node_identifier} (value: {value}).")
-            else:
-                if isinstance(value, bool):
-                    ua_variant_to_write = ua.Variant(value, ua.VariantType.Boolean)
-                elif isinstance(value, int): 
-                    ua_variant_to_write = ua.Variant(value, ua.VariantType.Int64) # Default to Int64 for platform consistency
-                elif isinstance(value, float):
-                    ua_variant_to_write = ua.Variant(value, ua.VariantType.Double) # Default to Double
-                elif isinstance(value, str):
-                    ua_variant_to_write = ua.Variant(value, ua.VariantType.String)
-                else:
-                    ua_variant_to_write = ua.Variant(value) 
-                if "xWatchDog" not in node_identifier and "WatchDog" not in node_identifier :
-                    logger.info(f"OPCUAClient: Inferred datatype {ua_variant_to_write.VariantType.name} for {node_identifier} (value: {value}).")
+            ua_variant_to_write = self._build_write_variant(node_identifier, value, datatype)
+            quiet = _is_quiet_write(node_identifier)
             
-            if "xWatchDog" not in node_identifier and "WatchDog" not in node_identifier :
+            if not quiet:
                 logger.info(f"OPCUAClient: Attempting to write value: {value} (Final UA Variant: {ua_variant_to_write}) to {node_identifier}")
             
             initial_type_used_for_write_attempt = ua_variant_to_write.VariantType
@@ -171,10 +516,11 @@ class OPCUAClient:
                             alt_ua_value = ua.Variant(value, alt_type)
                             await node.write_value(alt_ua_value)
                             logger.info(f"OPCUAClient: Successfully wrote {value} with alternative type {alt_type.name} to {node_identifier}")
+                            self._write_type_cache[node_identifier] = alt_type
                             return True
                         except ua.UaStatusCodeError as alt_type_error:
                             if "BadTypeMismatch" in str(alt_type_error):
-                                logger.debug(f"OPCUAClient: Type {alt_type.name} also mismatched for {node_identifier}: {alt_type_error}")
+                                logger.debug("OPCUAClient: Type %s also mismatched for %s: %s", alt_type.name, node_identifier, alt_type_error)
                             else: 
                                 logger.warning(f"OPCUAClient: Non-mismatch OPC UA error with alt type {alt_type.name} for {node_identifier}: {alt_type_error}")
                                 break # Stop trying if it's not a type mismatch
@@ -184,6 +530,9 @@ class OPCUAClient:
                     
                     logger.error(f"OPCUAClient: All alternative integer types failed for {node_identifier}. Initial type was {initial_type_used_for_write_attempt.name}. Last error: {type_error}")
                     return False 
+                elif type_error.code == ua.StatusCodes.BadNodeIdUnknown:
+                    self._forget_node(node_identifier) # The next write resolves the path again
+                    return False
                 else: 
                     logger.error(f"OPCUAClient: Unhandled OPC UA Error for {node_identifier} (Value: {value}, Type attempted: {initial_type_used_for_write_attempt.name}): {type_error}")
                     return False